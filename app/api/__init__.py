@@ -1,5 +1,19 @@
 from .auth import router as auth_router
 from .users import router as users_router
 from .plaka import router as plaka_router
+from .health import router as health_router
+from .detections import router as detections_router
+from .jobs import router as jobs_router
+from .metrics import router as metrics_router
+from .models import router as models_router
 
-__all__ = ["auth_router", "users_router", "plaka_router"]
+__all__ = [
+    "auth_router",
+    "users_router",
+    "plaka_router",
+    "health_router",
+    "detections_router",
+    "jobs_router",
+    "metrics_router",
+    "models_router"
+]
@@ -1,21 +1,29 @@
 from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
 from app.database.database import get_db
-from app.crud.user import get_user_by_email, create_user
+from app.crud.user import get_user_by_email, create_user, update_user
 from app.schemas.user import UserCreate, UserLogin, User as UserSchema
 from app.schemas.token import Token
-from app.core.security import create_access_token, hash_password, verify_password
+from app.models.user import User
+from app.core.security import (
+    create_access_token,
+    hash_password_async,
+    verify_password_async,
+    needs_rehash,
+    get_password_metrics,
+    require_model_admin,
+)
 from app.core.config import settings
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 @router.post("/register", response_model=UserSchema)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """Yeni kullanıcı kaydı"""
     # Email kontrolü
-    db_user = get_user_by_email(db, user.email)
+    db_user = await get_user_by_email(db, user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -23,15 +31,15 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Şifreyi hash'le
-    hashed_password = hash_password(user.password)
+    hashed_password = await hash_password_async(user.password)
     
     # Yeni kullanıcı oluştur
-    return create_user(db, user.email, user.username, hashed_password)
+    return await create_user(db, user.email, user.username, hashed_password)
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """Kullanıcı girişi"""
-    user = get_user_by_email(db, user_credentials.email)
+    user = await get_user_by_email(db, user_credentials.email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,13 +47,18 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not verify_password(user_credentials.password, user.hashed_password):
+    if not await verify_password_async(user_credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Geçersiz email veya şifre",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Maliyet faktörü değiştiyse şifreyi yeni maliyetle tekrar hash'le
+    if needs_rehash(user.hashed_password):
+        new_hash = await hash_password_async(user_credentials.password)
+        await update_user(db, user.id, hashed_password=new_hash)
+    
     # Access token oluştur
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -53,3 +66,9 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
+
+
+@router.get("/password-metrics")
+async def password_metrics(current_user: User = Depends(require_model_admin)):
+    """bcrypt havuzu ve işlem süresi metriklerini döner (yalnızca yöneticiler)"""
+    return get_password_metrics()
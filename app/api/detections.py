@@ -0,0 +1,43 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Optional
+
+from app.database.database import get_db
+from app.crud.detection import get_detections
+from app.schemas.detection import DetectionPage
+from app.core.security import get_current_user
+from app.models.user import User
+
+router = APIRouter(prefix="/detections", tags=["Detections"])
+
+@router.get("/", response_model=DetectionPage)
+async def list_detections(
+    source: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Kullanıcının geçmiş tespitlerini yeniden eskiye listeler
+    
+    Args:
+        source: Kaynak (kamera) filtresi
+        since: Bu zamandan itibaren (dahil)
+        until: Bu zamana kadar (hariç)
+        limit: Sayfa boyutu
+        cursor: Önceki sayfanın `next_cursor` değeri
+    """
+    try:
+        detections, next_cursor = await get_detections(
+            db, current_user.id, source=source, since=since, until=until, limit=limit, cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Geçersiz sayfa imleci"
+        )
+    return DetectionPage(items=detections, next_cursor=next_cursor)
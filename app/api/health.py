@@ -0,0 +1,24 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.api.plaka import plaka_service
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+@router.get("/live")
+async def liveness():
+    """Süreç ayakta ve event loop cevap veriyor mu?"""
+    return {"status": "alive"}
+
+@router.get("/ready")
+async def readiness():
+    """Model yüklenip ısındırıldıysa 200, aksi halde 503 döner"""
+    model_status = plaka_service.get_model_status()
+    body = {
+        "status": "ready" if plaka_service.is_ready else "not_ready",
+        "model_state": model_status["state"],
+        "progress": model_status["progress"],
+    }
+    if not plaka_service.is_ready:
+        return JSONResponse(status_code=503, content=body)
+    return body
@@ -0,0 +1,133 @@
+from fastapi import APIRouter, HTTPException, Depends, status, File, UploadFile, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional
+import json
+import uuid
+
+from app.database.database import get_db
+from app.crud.job import create_job, get_job, get_user_jobs
+from app.schemas.job import JobStatus
+from app.schemas.plaka import PlakaResponse
+from app.core.security import get_current_user
+from app.core.config import settings
+from app.models.user import User
+from app.api.plaka import plaka_service, process_detection_job
+from app.services.job_queue import JobQueue, check_callback_url
+from app.utils.upload_utils import read_upload
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+# Veritabanı tabanlı iş kuyruğu; işçiler main.py'deki lifespan içinde başlatılır
+job_queue = JobQueue(process_detection_job, is_ready=lambda: plaka_service.is_ready)
+
+@router.post("/", response_model=JobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(
+    file: UploadFile = File(...),
+    kind: str = Query("detect", pattern="^(detect|detect-image)$"),
+    confidence: float = 0.75,
+    priority: int = Query(0, ge=-100, le=100),
+    max_attempts: int = Query(None, ge=1, le=10),
+    callback_url: Optional[str] = None,
+    source: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Tespit işini kuyruğa ekler ve iş numarasını hemen döner
+    
+    Args:
+        file: Yüklenecek görüntü dosyası
+        kind: detect (JSON) veya detect-image (JSON + işaretlenmiş görüntü)
+        confidence: Güven eşiği (0.0 - 1.0 arası)
+        priority: Büyük değerli işler önce çalışır
+        max_attempts: Hata durumunda en fazla deneme sayısı
+        callback_url: İş bittiğinde sonucun POST edileceği adres
+        source: Görüntünün kaynağı (ör. kamera kimliği)
+    """
+    if callback_url is not None:
+        try:
+            await run_in_threadpool(check_callback_url, callback_url)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    contents = await read_upload(file)
+    job_id = str(uuid.uuid4())
+    input_path = await run_in_threadpool(job_queue.save_input, job_id, contents)
+    job = await create_job(
+        db, job_id, current_user.id, input_path,
+        kind=kind,
+        confidence=confidence,
+        priority=priority,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        source=source,
+        callback_url=callback_url
+    )
+    job_queue.notify()
+    return job
+
+@router.get("/", response_model=List[JobStatus])
+async def list_jobs(
+    status_filter: Optional[str] = Query(None, alias="status"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Kullanıcının işlerini listeler"""
+    return await get_user_jobs(db, current_user.id, status=status_filter, limit=limit)
+
+@router.get("/queue-stats")
+async def get_queue_stats():
+    """İş kuyruğu işçi sayaçlarını döner"""
+    return job_queue.get_stats()
+
+async def _get_own_job(db: AsyncSession, job_id: str, user: User):
+    job = await get_job(db, job_id, user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    return job
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def get_job_status(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """İşin durumunu döner"""
+    return await _get_own_job(db, job_id, current_user)
+
+@router.get("/{job_id}/result", response_model=PlakaResponse)
+async def get_job_result(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Tamamlanan işin tespit sonucunu döner"""
+    job = await _get_own_job(db, job_id, current_user)
+    if job.status != "succeeded":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"İş henüz tamamlanmadı (durum: {job.status})"
+        )
+    return json.loads(job.result_json)
+
+@router.get("/{job_id}/image")
+async def get_job_image(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """detect-image işinin işaretlenmiş görüntüsünü döner"""
+    job = await _get_own_job(db, job_id, current_user)
+    if job.status != "succeeded":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"İş henüz tamamlanmadı (durum: {job.status})"
+        )
+    if not job.result_image_path:
+        raise HTTPException(status_code=404, detail="Bu iş için görüntü yok ya da saklama süresi doldu")
+    return FileResponse(path=job.result_image_path, media_type=job.result_media_type)
@@ -0,0 +1,54 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.api.plaka import plaka_service, inference_executor, micro_batcher, fair_scheduler, detection_cache, detection_writer
+from app.api.jobs import job_queue
+from app.core.security import password_executor, password_latency, token_cache, user_cache
+from app.utils.metrics import REGISTRY, Counter, Gauge, process_rss_bytes
+
+router = APIRouter(tags=["Metrics"])
+
+def _register_gauge(name: str, description: str, func):
+    REGISTRY.register(Gauge(name, description, func=func))
+
+def _register_counter(name: str, description: str, func):
+    REGISTRY.register(Counter(name, description, func=func))
+
+# Değerler yalnızca /metrics okunurken hesaplanır, istek yoluna maliyet eklenmez
+_register_gauge("plaka_model_ready", "Model yüklenip ısındırıldıysa 1", lambda: int(plaka_service.is_ready))
+_register_gauge("plaka_model_memory_bytes", "Model yüklemesiyle artan süreç belleği",
+                lambda: plaka_service.model_memory_bytes or 0)
+_register_gauge("process_resident_memory_bytes", "Sürecin yerleşik bellek (RSS) kullanımı", process_rss_bytes)
+_register_gauge("plaka_inference_in_flight", "Çıkarım havuzunda çalışan ya da bekleyen iş sayısı",
+                lambda: inference_executor.get_status()["pending"])
+_register_counter("plaka_inference_rejected_total", "Kuyruk dolu olduğu için 503 ile reddedilen iş sayısı",
+                  lambda: inference_executor.get_status()["rejected"])
+_register_gauge("plaka_batch_queue_depth", "Mikro-batch kuyruğunda bekleyen görüntü sayısı",
+                lambda: micro_batcher.get_stats()["queue_depth"])
+_register_gauge("plaka_scheduler_in_flight", "Adil sıralayıcının çıkarıma bıraktığı istek sayısı",
+                lambda: fair_scheduler.get_stats()["in_flight"])
+_register_gauge("password_hash_in_flight", "bcrypt havuzunda çalışan ya da bekleyen iş sayısı",
+                lambda: password_executor.get_status()["pending"])
+_register_gauge("detection_writer_buffered", "Veritabanına yazılmayı bekleyen tespit satırı sayısı",
+                lambda: detection_writer.get_stats()["buffered"])
+_register_counter("detection_writer_dropped_total", "Tampon dolu olduğu için düşürülen tespit satırı sayısı",
+                  lambda: detection_writer.dropped)
+_register_gauge("job_queue_workers", "Çalışan iş kuyruğu işçisi sayısı", lambda: job_queue.get_stats()["workers"])
+_register_counter("job_queue_processed_total", "Başarıyla tamamlanan iş sayısı", lambda: job_queue.processed)
+_register_counter("job_queue_failed_total", "Başarısız olan iş sayısı", lambda: job_queue.failed)
+_register_counter("detection_cache_hits_total", "Tespit önbelleği isabet sayısı",
+                  lambda: detection_cache.hits)
+_register_counter("detection_cache_misses_total", "Tespit önbelleği ıskalama sayısı",
+                  lambda: detection_cache.misses)
+_register_counter("user_cache_hits_total", "Kullanıcı önbelleği isabet sayısı", lambda: user_cache.hits)
+_register_counter("token_cache_hits_total", "Token önbelleği isabet sayısı", lambda: token_cache.hits)
+
+REGISTRY.register(micro_batcher.batch_size_histogram)
+REGISTRY.register(micro_batcher.queue_wait_histogram)
+for histogram in password_latency.values():
+    REGISTRY.register(histogram)
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metin formatında metrikleri döner"""
+    return Response(content=REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,103 @@
+from fastapi import APIRouter, HTTPException, Depends, status, Query
+from typing import Optional
+import asyncio
+import os
+
+from app.core.security import get_current_user, require_model_admin
+from app.core.config import settings
+from app.models.user import User
+from app.api.plaka import plaka_service
+from app.services.inference_backends import BACKENDS
+
+router = APIRouter(prefix="/plaka/models", tags=["Models"])
+
+def _resolve_model_file(filename: str) -> str:
+    """Model dosyasını MODEL_DIR altında çözer; dizin dışına çıkan yolları reddeder"""
+    model_dir = os.path.realpath(settings.MODEL_DIR)
+    path = os.path.realpath(os.path.join(model_dir, filename))
+    if os.path.commonpath([model_dir, path]) != model_dir or not os.path.isfile(path):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Model dosyası {settings.MODEL_DIR} dizininde bulunamadı: {filename}"
+        )
+    return path
+
+def _load_in_background(name: str, model_path: str, backend: Optional[str], activate: bool,
+                        candidate_share: Optional[float]):
+    try:
+        entry = plaka_service.load_model(name, model_path, backend, activate=activate, candidate_share=candidate_share)
+        print(f"Model yüklendi: {name} ({entry.version})")
+    except Exception as e:
+        print(f"Model yüklenemedi ({name}): {e}")
+
+@router.get("/")
+async def list_models(current_user: User = Depends(get_current_user)):
+    """Yüklü modelleri, aktif/aday modeli, bellek kullanımını ve gecikmeleri listeler"""
+    return plaka_service.registry.get_status()
+
+@router.post("/{name}/load", status_code=status.HTTP_202_ACCEPTED)
+async def load_model(
+    name: str,
+    filename: str = Query(..., description="MODEL_DIR altındaki model dosyası"),
+    backend: Optional[str] = Query(None, description="ultralytics, onnx veya openvino"),
+    activate: bool = False,
+    candidate_share: Optional[float] = Query(None, ge=0, le=1, description="A/B testi için aday trafik oranı"),
+    current_user: User = Depends(require_model_admin)
+):
+    """
+    Modeli (ya da mevcut modelin yeni sürümünü) arka planda yükler
+    
+    Isınma bitene kadar istekler mevcut modelle karşılanır; ardından model `activate`
+    ise tek adımda aktif olur, `candidate_share` verildiyse A/B adayı olur.
+    """
+    if backend is not None and backend not in BACKENDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bilinmeyen model arka ucu: {backend}"
+        )
+    if name in plaka_service.registry.loading:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"{name} zaten yükleniyor"
+        )
+    model_path = _resolve_model_file(filename)
+    
+    asyncio.get_running_loop().run_in_executor(
+        None, _load_in_background, name, model_path, backend, activate, candidate_share
+    )
+    return {"name": name, "model_path": model_path, "status": "loading"}
+
+@router.post("/{name}/activate")
+async def activate_model(name: str, current_user: User = Depends(require_model_admin)):
+    """Tüm trafiği bu modele geçirir"""
+    try:
+        plaka_service.registry.activate(name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Model bulunamadı")
+    return plaka_service.registry.get_status()
+
+@router.post("/{name}/candidate")
+async def set_candidate_model(
+    name: str,
+    share: float = Query(..., ge=0, le=1, description="Adaya gidecek trafik oranı (0 ise A/B kapanır)"),
+    current_user: User = Depends(require_model_admin)
+):
+    """Modeli A/B testi adayı yapar"""
+    try:
+        plaka_service.registry.set_candidate(name if share > 0 else None, share)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Model bulunamadı")
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return plaka_service.registry.get_status()
+
+@router.delete("/{name}")
+async def unload_model(name: str, current_user: User = Depends(require_model_admin)):
+    """Aktif olmayan modeli bellekten çıkarır"""
+    try:
+        plaka_service.registry.unload(name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Model bulunamadı")
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"message": f"{name} kaldırıldı"}
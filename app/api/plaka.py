@@ -1,67 +1,313 @@
-from fastapi import APIRouter, HTTPException, Depends, status, File, UploadFile
-from fastapi.responses import FileResponse
-import cv2
-import numpy as np
+from fastapi import APIRouter, HTTPException, Depends, status, File, UploadFile, Header, Query, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import itertools
 import os
+import shutil
 import tempfile
+import numpy as np
 
-from app.core.security import get_current_user
+from app.core.security import get_current_user, decode_token
+from app.database.database import get_db, SessionLocal
+from app.crud.user import get_user_by_id
 from app.models.user import User
-from app.schemas.plaka import PlakaResponse
+from app.schemas.plaka import PlakaResponse, PlakaVideoResponse
 from app.services.plaka_service import PlakaService
+from app.services.inference_executor import InferenceExecutor
+from app.services.batch_scheduler import MicroBatcher
+from app.services.fair_scheduler import FairScheduler
+from app.services.detection_cache import DetectionCache
+from app.services.plate_tracker import IoUTracker
+from app.services.video_service import MotionGate, VideoFrameReader
+from app.services.detection_writer import DetectionWriter
+from app.services.tiling import TileOptions
+from app.utils.image_utils import (
+    negotiate_image_format, encode_image, reduced_decode_factor, jpeg_dimensions, sniff_image_format
+)
+from app.utils.upload_utils import format_size, read_upload
+from app.utils.response_utils import (
+    DETECTION_FORMATS, content_disposition, detection_response, dumps_json, negotiate_detection_format
+)
+from app.utils.file_utils import is_archive, iter_archive_images, list_archive_images
+from app.utils.tracing import stage
+from app.core.config import settings
 
 router = APIRouter(prefix="/plaka", tags=["Plaka Detection"])
 
-# Plaka servisi instance'ı
+# Plaka servisi instance'ı; model main.py'deki lifespan içinde arka planda yüklenir
 plaka_service = PlakaService()
 
-@router.post("/detect", response_model=PlakaResponse)
+# Çıkarım havuzu; model event loop'u bloklamadan burada çalışır
+inference_executor = InferenceExecutor()
+
+# Eşzamanlı istekleri toplu tahmine çeviren mikro-batch katmanı
+micro_batcher = MicroBatcher(plaka_service, inference_executor)
+
+# Kullanıcı başına kuyruk, adil sıralama ve kotalar; istekler mikro-batch'e buradan sırayla girer
+fair_scheduler = FairScheduler()
+
+# Aynı görüntünün tekrar yüklenmesinde modeli çalıştırmamak için sonuç önbelleği
+detection_cache = DetectionCache()
+
+# Tespitleri istek yolunu bloklamadan toplu olarak veritabanına yazan arka plan yazıcısı
+detection_writer = DetectionWriter()
+
+def _decode_image(contents: bytes) -> np.ndarray:
+    """Yüklenen baytları OpenCV formatına çevirir"""
+    import cv2
+    
+    nparr = np.frombuffer(contents, np.uint8)
+    with stage("decode"):
+        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    
+    if image is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Görüntü okunamadı"
+        )
+    return image
+
+_REDUCED_FLAGS = {2: "IMREAD_REDUCED_COLOR_2", 4: "IMREAD_REDUCED_COLOR_4", 8: "IMREAD_REDUCED_COLOR_8"}
+
+def _decode_for_detection(contents: bytes) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Görüntüyü yalnızca tespit için decode eder
+    
+    Model girdisi MODEL_IMGSZ boyutuna küçültüleceği için çok büyük JPEG'ler DCT
+    ölçekleme ile 1/2, 1/4 ya da 1/8 çözünürlükte decode edilir; tam çözünürlüklü
+    tampon hiç oluşturulmaz.
+    
+    Returns:
+        Tuple: (görüntü, kutuları orijinal koordinatlara taşıyacak ölçek ya da None)
+    """
+    import cv2
+    
+    factor = reduced_decode_factor(contents, settings.MODEL_IMGSZ) if settings.DECODE_REDUCED_ENABLED else 1
+    if factor == 1:
+        return _decode_image(contents), None
+    
+    nparr = np.frombuffer(contents, np.uint8)
+    with stage("decode"):
+        image = cv2.imdecode(nparr, getattr(cv2, _REDUCED_FLAGS[factor]))
+    if image is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Görüntü okunamadı"
+        )
+    # Küçültülmüş boyut yukarı yuvarlandığı için ölçek gerçek boyutlardan hesaplanır
+    width, height = jpeg_dimensions(contents)
+    # imdecode EXIF yönünü uygular (dik çekilmiş telefon fotoğrafları); SOF boyutları ise
+    # döndürülmemiş halidir, bu durumda genişlik ve yükseklik yer değiştirir
+    decoded_ratio = image.shape[1] / image.shape[0]
+    if abs(height / width - decoded_ratio) < abs(width / height - decoded_ratio):
+        width, height = height, width
+    scale_x, scale_y = width / image.shape[1], height / image.shape[0]
+    return image, np.array([scale_x, scale_y, scale_x, scale_y, 1.0], dtype=np.float32)
+
+def _tile_options(
+    tile: Optional[bool] = Query(None, description="Parçalı çıkarım (verilmezse TILING_ENABLED)"),
+    tile_size: Optional[int] = Query(None, ge=64, le=4096, description="Parça kenar uzunluğu (piksel)"),
+    tile_overlap: Optional[float] = Query(None, ge=0.0, le=0.5, description="Komşu parçaların örtüşme oranı"),
+    tile_min_side: Optional[int] = Query(None, ge=0, description="Parçalamanın başladığı en küçük uzun kenar (piksel)"),
+) -> TileOptions:
+    """Parçalı çıkarım sorgu parametrelerini toplar"""
+    return TileOptions(tile, tile_size, tile_overlap, tile_min_side)
+
+async def _detect_boxes(contents: bytes, confidence: float, image: Optional[np.ndarray] = None,
+                        tiling: Optional[TileOptions] = None) -> Tuple[np.ndarray, str]:
+    """
+    Önbelleğe bakar, yoksa görüntüyü (gerekirse) decode edip modeli çalıştırır
+    
+    Args:
+        contents: Yüklenen ham baytlar
+        confidence: Güven eşiği
+        image: Daha önce decode edilmiş görüntü (varsa)
+        tiling: Parçalı çıkarım ayarları (verilmezse ayarlardaki varsayılanlar)
+    
+    Returns:
+        Tuple: ((N, 5) boyutlu kutu dizisi, sonucu üreten modelin sürümü)
+    """
+    # Model hazır değilse decode etmeden reddet
+    plaka_service.ensure_ready()
+    
+    # A/B testi açıksa istek aday modele yönlenebilir; önbellek anahtarı modelin sürümünü içerir
+    entry = plaka_service.route()
+    tiling = tiling or TileOptions()
+    cache_key = detection_cache.make_key(contents, entry.version + tiling.cache_tag)
+    if detection_cache.disk_dir:
+        boxes = await run_in_threadpool(detection_cache.get, cache_key, confidence)
+    else:
+        boxes = detection_cache.get(cache_key, confidence)
+    if boxes is not None:
+        return boxes, entry.version
+    
+    scale = None
+    if image is None and tiling.enabled:
+        # Parçalar küçük plakaları tam çözünürlükte görmek için vardır; küçültülmüş decode yapılmaz
+        image = await run_in_threadpool(_decode_image, contents)
+    elif image is None:
+        image, scale = await run_in_threadpool(_decode_for_detection, contents)
+    
+    # Düşük eşikle çalıştırılıp saklanır, farklı eşikler maskeleme ile cevaplanır
+    base_threshold = detection_cache.base_threshold(confidence) if detection_cache.enabled else confidence
+    if tiling.applies(image.shape):
+        # Parçalar zaten tek bir toplu tahmin olduğu için mikro-batch kuyruğuna girmez
+        boxes = await inference_executor.run(
+            plaka_service.detect_plates_tiled, image, base_threshold, tiling, entry.name
+        )
+    else:
+        boxes = await micro_batcher.submit(image, base_threshold, entry.name)
+    if scale is not None:
+        # Küçültülmüş görüntüdeki kutuları orijinal koordinatlara taşı
+        boxes = boxes * scale
+    if detection_cache.disk_dir:
+        await run_in_threadpool(detection_cache.put, cache_key, boxes, base_threshold)
+    else:
+        detection_cache.put(cache_key, boxes, base_threshold)
+    return plaka_service.filter_boxes(boxes, confidence), entry.version
+
+def _check_ocr(ocr: bool):
+    """OCR istenmiş ama etkin değilse görüntüyü işlemeden reddeder"""
+    if ocr and plaka_service.is_ready and plaka_service.ocr is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Plaka okuma (OCR) etkin değil"
+        )
+
+async def _detect_and_read(contents: bytes, confidence: float, ocr: bool, image: Optional[np.ndarray] = None,
+                           tiling: Optional[TileOptions] = None):
+    """
+    Tespit yapar, istenirse plakaları aynı decode edilmiş görüntüden okur
+    
+    Returns:
+        Tuple: (kutu dizisi, OCR sonuçları ya da None, modelin sürümü)
+    """
+    if not ocr:
+        boxes, model_version = await _detect_boxes(contents, confidence, image, tiling)
+        return boxes, None, model_version
+    
+    # Kırpmalar için görüntü yalnızca bir kez decode edilir; tespit ve okuma aynı tamponu kullanır
+    if image is None:
+        image = await run_in_threadpool(_decode_image, contents)
+    boxes, model_version = await _detect_boxes(contents, confidence, image, tiling)
+    if len(boxes) == 0:
+        return boxes, [], model_version
+    readings = await inference_executor.run(plaka_service.read_plates, image, boxes)
+    return boxes, readings, model_version
+
+def _build_payload(boxes: np.ndarray, readings: Optional[list] = None) -> dict:
+    """
+    Kutu dizisinden (varsa OCR sonuçlarıyla) PlakaResponse yapısında sözlük oluşturur
+    
+    Alanlar zaten doğru tiplerde üretildiği için Pydantic modelleri kurulmaz ve
+    yanıt tekrar doğrulanmaz.
+    """
+    detections = plaka_service.boxes_to_detections(boxes, readings)
+    for detection in detections:
+        detection.setdefault("plate_text", None)
+        detection.setdefault("char_confidences", None)
+    return {
+        "detections": detections,
+        "total_detections": len(detections),
+        "message": f"{len(detections)} adet plaka tespit edildi",
+    }
+
+def _batch_line(index: int, filename: str, result: Optional[dict] = None, error: Optional[str] = None) -> bytes:
+    """PlakaBatchItem yapısında tek bir NDJSON satırı"""
+    return dumps_json({"index": index, "filename": filename, "result": result, "error": error}) + b"\n"
+
+async def _job_user(user_id: str) -> User:
+    """İşin sahibini kota alanlarıyla birlikte yükler; kullanıcı silinmişse iş kalıcı olarak başarısız olur"""
+    async with SessionLocal() as db:
+        user = await get_user_by_id(db, user_id)
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="İşin sahibi olan kullanıcı bulunamadı")
+        db.expunge(user)
+    return user
+
+async def process_detection_job(job, contents: bytes):
+    """
+    Kuyruktaki bir tespit işini çalıştırır
+    
+    İşler de kullanıcının adil sıralama kuyruğundan geçer; kuyruk işçileri bir
+    kullanıcının yüzlerce işini diğer kullanıcıların isteklerinin önüne geçiremez.
+    
+    Returns:
+        Tuple: (PlakaResponse sözlüğü, detect-image işleri için (görüntü baytları, media type))
+    """
+    user = await _job_user(job.user_id)
+    image = None
+    if job.kind == "detect-image":
+        image = await run_in_threadpool(_decode_image, contents)
+    async with fair_scheduler.slot(user, wait=True):
+        boxes, model_version = await _detect_boxes(contents, job.confidence, image)
+    detection_writer.enqueue(job.user_id, boxes, job.source, model_version)
+    
+    annotated = None
+    if image is not None:
+        marked_image = await run_in_threadpool(plaka_service.render_detections, image, boxes)
+        content, media_type, _ = await run_in_threadpool(encode_image, marked_image, settings.IMAGE_OUTPUT_FORMAT)
+        annotated = (content, media_type)
+    return _build_payload(boxes), annotated
+
+@router.post(
+    "/detect",
+    response_model=PlakaResponse,
+    responses={200: {"content": {media_type: {} for media_type in DETECTION_FORMATS.values()}}},
+)
 async def detect_plates_endpoint(
     file: UploadFile = File(...),
     confidence: float = 0.75,
+    source: Optional[str] = None,
+    ocr: bool = False,
+    tiling: TileOptions = Depends(_tile_options),
+    accept: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user)
 ):
     """
     Yüklenen görüntüde plaka tespiti yapar
     
+    Yanıt formatı Accept başlığıyla seçilir: application/json (varsayılan),
+    application/msgpack ya da application/x-plaka-boxes (little-endian float32
+    [x1, y1, x2, y2, confidence] satırları; kutu sayısı X-Detections-Count başlığında).
+    
     Args:
         file: Yüklenecek görüntü dosyası
         confidence: Güven eşiği (0.0 - 1.0 arası)
+        source: Görüntünün kaynağı (ör. kamera kimliği), tespit geçmişinde saklanır
+        ocr: True ise plaka metni ve karakter güvenleri de döner
+        tiling: Parçalı çıkarım ayarları (tile, tile_size, tile_overlap, tile_min_side)
+        accept: İsteğin Accept başlığı
         current_user: Giriş yapmış kullanıcı
     
     Returns:
-        PlakaResponse: Tespit edilen plakaların bilgileri
+        Response: Tespit edilen plakaların bilgileri
     """
-    # Dosya türü kontrolü
-    if not file.content_type.startswith('image/'):
+    detection_format = negotiate_detection_format(accept)
+    if detection_format == "boxes" and ocr:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Sadece görüntü dosyaları kabul edilir"
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail="Plaka metinleri paketlenmiş kutu formatında döndürülemez (JSON veya MessagePack isteyin)"
         )
+    _check_ocr(ocr)
     
     try:
-        # Dosyayı oku
-        contents = await file.read()
-        
-        # OpenCV formatına çevir
-        nparr = np.frombuffer(contents, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        if image is None:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Görüntü okunamadı"
-            )
+        # Dosyayı boyut sınırıyla parça parça oku; imzası tanınmayan dosyalar hemen reddedilir
+        with stage("upload_read"):
+            contents = await read_upload(file)
         
-        # Plaka tespiti yap
-        marked_image, detections = plaka_service.detect_plates(image, confidence)
-        
-        return PlakaResponse(
-            detections=detections,
-            total_detections=len(detections),
-            message=f"{len(detections)} adet plaka tespit edildi"
-        )
+        # Plaka tespiti yap (OCR istenmediyse ve önbellekte varsa decode bile edilmez)
+        async with fair_scheduler.slot(current_user):
+            boxes, readings, model_version = await _detect_and_read(contents, confidence, ocr, tiling=tiling)
+        detection_writer.enqueue(current_user.id, boxes, source, model_version)
+        payload = _build_payload(boxes, readings) if detection_format != "boxes" else None
+        return detection_response(payload, boxes, detection_format)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -72,6 +318,12 @@ async def detect_plates_endpoint(
 async def detect_plates_with_image(
     file: UploadFile = File(...),
     confidence: float = 0.75,
+    format: Optional[str] = Query(None, description="Çıktı formatı: jpeg, webp veya png"),
+    quality: Optional[int] = Query(None, ge=0, le=100, description="JPEG/WebP kalitesi ya da PNG sıkıştırma seviyesi"),
+    source: Optional[str] = None,
+    ocr: bool = False,
+    tiling: TileOptions = Depends(_tile_options),
+    accept: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -80,61 +332,392 @@ async def detect_plates_with_image(
     Args:
         file: Yüklenecek görüntü dosyası
         confidence: Güven eşiği (0.0 - 1.0 arası)
+        format: Çıktı formatı (verilmezse Accept başlığına bakılır)
+        quality: Kodlama kalitesi (verilmezse ayarlardaki değer kullanılır)
+        source: Görüntünün kaynağı (ör. kamera kimliği), tespit geçmişinde saklanır
+        ocr: True ise okunan plaka metni etikete yazılır
+        tiling: Parçalı çıkarım ayarları (tile, tile_size, tile_overlap, tile_min_side)
         current_user: Giriş yapmış kullanıcı
     
     Returns:
-        FileResponse: İşaretlenmiş görüntü dosyası
+        Response: Bellekte kodlanmış işaretlenmiş görüntü
     """
-    # Dosya türü kontrolü
-    if not file.content_type.startswith('image/'):
+    # Çıktı formatı kontrolü
+    image_format = negotiate_image_format(format, accept)
+    if image_format is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Sadece görüntü dosyaları kabul edilir"
+            detail="Desteklenmeyen çıktı formatı (jpeg, webp veya png kullanın)"
         )
+    if image_format == "png" and quality is not None and quality > 9:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="PNG için sıkıştırma seviyesi 0-9 arası olmalıdır"
+        )
+    _check_ocr(ocr)
     
     try:
-        # Dosyayı oku
-        contents = await file.read()
+        # Dosyayı boyut sınırıyla parça parça oku; imzası tanınmayan dosyalar hemen reddedilir
+        with stage("upload_read"):
+            contents = await read_upload(file)
         
-        # OpenCV formatına çevir
-        nparr = np.frombuffer(contents, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        # İşaretlenmiş görüntü istendiği için tam çözünürlükte decode edilir
+        image = await run_in_threadpool(_decode_image, contents)
         
-        if image is None:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Görüntü okunamadı"
-            )
+        # Plaka tespiti yap; OCR kırpmaları çizimden önce aynı tampondan alınır
+        async with fair_scheduler.slot(current_user):
+            boxes, readings, model_version = await _detect_and_read(contents, confidence, ocr, image, tiling)
+        detection_writer.enqueue(current_user.id, boxes, source, model_version)
         
-        # Plaka tespiti yap
-        marked_image, detections = plaka_service.detect_plates(image, confidence)
+        # Decode edilen tampon bu isteğe ait olduğu için doğrudan üzerine çizilir
+        marked_image = await run_in_threadpool(plaka_service.render_detections, image, boxes, True, readings)
         
-        # İşaretlenmiş görüntüyü JPEG formatına çevir
-        success, buffer = cv2.imencode('.jpg', marked_image)
-        if not success:
+        # İşaretlenmiş görüntüyü bellekte istenen formata çevir
+        try:
+            content, media_type, extension = await run_in_threadpool(
+                encode_image, marked_image, image_format, quality
+            )
+        except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Görüntü işlenemedi"
             )
         
-        # Geçici dosya oluştur
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
-            tmp_file.write(buffer.tobytes())
-            tmp_file_path = tmp_file.name
+        # Geçici dosya yazmadan doğrudan tampondan yanıt dön
+        filename = f"detected_plates_{current_user.username}{extension}"
+        return Response(
+            content=content,
+            media_type=media_type,
+            headers={
+                "Content-Disposition": content_disposition(filename),
+                "Vary": "Accept",
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"İşlem sırasında hata oluştu: {str(e)}"
+        )
+
+@router.post("/detect-batch")
+async def detect_plates_batch(
+    files: List[UploadFile] = File(...),
+    confidence: float = 0.75,
+    source: Optional[str] = None,
+    ocr: bool = False,
+    tiling: TileOptions = Depends(_tile_options),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Birden fazla görüntüde ya da zip/tar arşivindeki görüntülerde plaka tespiti yapar
+    
+    Sonuçlar her görüntü bittiğinde bir satır olacak şekilde NDJSON olarak akıtılır.
+    
+    Args:
+        files: Görüntü dosyaları ve/veya zip/tar arşivleri
+        confidence: Güven eşiği (0.0 - 1.0 arası)
+        source: Kaynak etiketi (verilmezse dosya adı kullanılır)
+        ocr: True ise plaka metinleri de döner
+        tiling: Parçalı çıkarım ayarları (tile, tile_size, tile_overlap, tile_min_side)
+        current_user: Giriş yapmış kullanıcı
+    
+    Returns:
+        StreamingResponse: Her satırı PlakaBatchItem yapısında olan NDJSON akışı
+    """
+    _check_ocr(ocr)
+    
+    # Arşivler burada yalnızca listelenir (içerik açılmaz); dosya sayısı ve toplam açılmış
+    # boyut akış başlamadan kontrol edilir, görüntüler akış sırasında grup grup açılır
+    sources = []
+    total_files = 0
+    total_bytes = 0
+    for upload in files:
+        # Arşivler tek bir görüntüden büyük olabildiği için burada yalnızca istek sınırı uygulanır
+        contents = await read_upload(upload, settings.REQUEST_MAX_BODY_BYTES, require_image=False)
+        filename = upload.filename or f"file_{len(sources)}"
+        if is_archive(contents, filename):
+            try:
+                members = await run_in_threadpool(
+                    list_archive_images, contents, settings.BATCH_MAX_FILES - total_files + 1
+                )
+            except Exception:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Arşiv okunamadı: {filename}"
+                )
+            sources.append((filename, contents, True))
+            total_files += len(members)
+            # Sınırı aşan dosyalar açılmadan hata satırı olarak döner, toplama katılmaz
+            total_bytes += sum(size for _, size in members if size <= settings.UPLOAD_MAX_BYTES)
+        else:
+            sources.append((filename, contents, False))
+            total_files += 1
+        
+        if total_files > settings.BATCH_MAX_FILES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Tek istekte en fazla {settings.BATCH_MAX_FILES} görüntü gönderilebilir"
+            )
+        if total_bytes > settings.BATCH_MAX_DECOMPRESSED_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Arşivlerin açılmış toplam boyutu en fazla "
+                       f"{format_size(settings.BATCH_MAX_DECOMPRESSED_BYTES)} olabilir"
+            )
+    
+    if total_files == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="İşlenecek görüntü bulunamadı"
+        )
+    
+    def iter_items():
+        for filename, contents, archived in sources:
+            if archived:
+                yield from iter_archive_images(contents, settings.BATCH_MAX_FILES, settings.UPLOAD_MAX_BYTES)
+            else:
+                yield filename, contents
+    
+    async def process(index: int, filename: str, contents: Optional[bytes]) -> bytes:
+        if contents is None:
+            return _batch_line(index, filename, error="Dosya boyutu sınırı aşıldı")
+        if sniff_image_format(contents[:12]) is None:
+            return _batch_line(index, filename, error="Desteklenmeyen görüntü formatı")
+        if len(contents) > settings.UPLOAD_MAX_BYTES:
+            return _batch_line(index, filename, error="Dosya boyutu sınırı aşıldı")
+        try:
+            # Hız sınırında görüntüler reddedilmez, kullanıcının hızına göre bekletilir
+            async with fair_scheduler.slot(current_user, wait=True):
+                boxes, readings, model_version = await _detect_and_read(contents, confidence, ocr, tiling=tiling)
+            detection_writer.enqueue(current_user.id, boxes, source or filename, model_version)
+            return _batch_line(index, filename, result=_build_payload(boxes, readings))
+        except HTTPException as e:
+            return _batch_line(index, filename, error=str(e.detail))
+        except Exception as e:
+            return _batch_line(index, filename, error=f"İşlem sırasında hata oluştu: {str(e)}")
+    
+    async def stream():
+        # Görüntüler batch boyutunda gruplar halinde açılıp paralel decode edilir ve modele verilir;
+        # bellekte aynı anda yalnızca bir grubun açılmış ve decode edilmiş hali bulunur
+        chunk_size = micro_batcher.max_batch_size
+        items = iter_items()
+        index = 0
+        tasks = []
+        try:
+            while True:
+                chunk = await run_in_threadpool(lambda: list(itertools.islice(items, chunk_size)))
+                if not chunk:
+                    break
+                tasks = [
+                    asyncio.create_task(process(item_index, filename, contents))
+                    for item_index, (filename, contents) in enumerate(chunk, start=index)
+                ]
+                index += len(chunk)
+                for finished in asyncio.as_completed(tasks):
+                    yield await finished
+        except Exception:
+            yield _batch_line(index, "", error="Arşiv okunamadı")
+        finally:
+            # İstemci koptuysa ya da akış kapatıldıysa kimsenin okumayacağı çıkarımlar iptal edilir;
+            # iptal edilen görevler kullanıcının kuyruk yerini de bırakır
+            for task in tasks:
+                task.cancel()
+            items.close()
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.post("/detect-video", response_model=PlakaVideoResponse)
+async def detect_plates_video(
+    file: UploadFile = File(...),
+    confidence: float = 0.75,
+    frame_skip: Optional[int] = Query(None, ge=1, description="Her kaç karede bir işlem yapılacağı"),
+    motion_threshold: Optional[float] = Query(None, ge=0, description="Hareket eşiği (0 ise kapalı)"),
+    source: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Yüklenen videoda plaka tespiti yapar ve kareler arası izleri birleştirir
+    
+    Args:
+        file: Yüklenecek video dosyası
+        confidence: Güven eşiği (0.0 - 1.0 arası)
+        frame_skip: Kare atlama aralığı (verilmezse ayarlardaki değer)
+        motion_threshold: Hareket filtresi eşiği (verilmezse ayarlardaki değer)
+        source: Kaynak etiketi (verilmezse dosya adı kullanılır)
+        current_user: Giriş yapmış kullanıcı
+    
+    Returns:
+        PlakaVideoResponse: Her plaka için tek bir iz
+    """
+    plaka_service.ensure_ready()
+    
+    # VideoCapture dosya yolu beklediği için yükleme geçici dosyaya akıtılır
+    suffix = os.path.splitext(file.filename or "")[1] or ".mp4"
+    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    try:
+        await run_in_threadpool(shutil.copyfileobj, file.file, tmp_file)
+        tmp_file.close()
+        
+        try:
+            reader = await run_in_threadpool(VideoFrameReader, tmp_file.name, frame_skip, motion_threshold)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Video okunamadı"
+            )
+        
+        tracker = IoUTracker()
+        try:
+            while not reader.finished:
+                frames = await run_in_threadpool(reader.read_batch, micro_batcher.max_batch_size)
+                if not frames:
+                    continue
+                # Her kare grubu kullanıcının kuyruğundan geçer; uzun videolar diğer kullanıcıları bekletmez
+                async with fair_scheduler.slot(current_user, wait=True):
+                    boxes_list = await inference_executor.run(
+                        plaka_service.detect_plates_batch,
+                        [frame for _, frame in frames],
+                        [confidence] * len(frames),
+                    )
+                for (frame_index, _), boxes in zip(frames, boxes_list):
+                    tracker.update(frame_index, boxes)
+        finally:
+            reader.release()
+        
+        tracks = tracker.tracks(reader.fps)
         
-        return FileResponse(
-            path=tmp_file_path,
-            media_type='image/jpeg',
-            filename=f"detected_plates_{current_user.username}.jpg"
+        # Her iz için en güvenli tespit kaydedilir
+        if tracks:
+            best_boxes = np.array([
+                [t["detection"][key] for key in ("x1", "y1", "x2", "y2", "confidence")] for t in tracks
+            ], dtype=np.float32)
+            detection_writer.enqueue(current_user.id, best_boxes, source or file.filename, plaka_service.model_version)
+        return PlakaVideoResponse(
+            tracks=tracks,
+            total_tracks=len(tracks),
+            frames_read=reader.frames_read,
+            frames_processed=reader.frames_sampled,
+            fps=reader.fps,
+            message=f"{len(tracks)} adet plaka tespit edildi"
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"İşlem sırasında hata oluştu: {str(e)}"
         )
+    finally:
+        tmp_file.close()
+        try:
+            os.remove(tmp_file.name)
+        except OSError:
+            pass
+
+@router.websocket("/stream")
+async def detect_plates_stream(
+    websocket: WebSocket,
+    token: str = Query(...),
+    confidence: float = 0.75,
+    frame_skip: int = Query(1, ge=1),
+    motion_threshold: Optional[float] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    WebSocket üzerinden gelen JPEG karelerinde plaka tespiti yapar
+    
+    İstemci her kareyi ikili (binary) mesaj olarak gönderir; sunucu işlenen her kare
+    için tespitleri ve iz numaralarını döner. "end" metin mesajı gönderildiğinde
+    birleştirilmiş izler döner ve bağlantı kapanır.
+    """
+    try:
+        current_user = await get_current_user(decode_token(token), db)
+        plaka_service.ensure_ready()
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    tracker = IoUTracker()
+    motion_gate = MotionGate(motion_threshold)
+    frame_index = -1
+    frames_processed = 0
+    
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("text") == "end":
+                tracks = tracker.tracks()
+                await websocket.send_json({
+                    "tracks": tracks,
+                    "total_tracks": len(tracks),
+                    "frames_received": frame_index + 1,
+                    "frames_processed": frames_processed,
+                })
+                await websocket.close()
+                break
+            
+            contents = message.get("bytes")
+            if not contents:
+                continue
+            frame_index += 1
+            if frame_index % frame_skip != 0:
+                continue
+            
+            try:
+                image = await run_in_threadpool(_decode_image, contents)
+            except HTTPException as e:
+                await websocket.send_json({"frame": frame_index, "error": e.detail})
+                continue
+            if not motion_gate.should_process(image):
+                continue
+            
+            try:
+                async with fair_scheduler.slot(current_user, wait=True):
+                    boxes = await micro_batcher.submit(image, confidence)
+            except HTTPException as e:
+                await websocket.send_json({"frame": frame_index, "error": e.detail})
+                continue
+            frames_processed += 1
+            track_ids = tracker.update(frame_index, boxes)
+            await websocket.send_json({
+                "frame": frame_index,
+                "detections": plaka_service.boxes_to_detections(boxes),
+                "track_ids": track_ids,
+            })
+    except WebSocketDisconnect:
+        pass
 
 @router.get("/model-status")
 async def get_model_status():
     """Model durumunu kontrol eder"""
-    return plaka_service.get_model_status()
+    model_status = plaka_service.get_model_status()
+    model_status["executor"] = inference_executor.get_status()
+    return model_status
+
+
+@router.get("/batching-stats")
+async def get_batching_stats():
+    """Mikro-batch histogramlarını döner"""
+    return micro_batcher.get_stats()
+
+@router.get("/scheduler-stats")
+async def get_scheduler_stats():
+    """Kullanıcı başına kuyruk derinliği ve kota kısıtlama sayaçlarını döner"""
+    return fair_scheduler.get_stats()
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """Tespit önbelleğinin isabet, ıskalama ve tahliye sayaçlarını döner"""
+    return detection_cache.get_stats()
+
+@router.get("/writer-stats")
+async def get_writer_stats():
+    """Tespit kayıt yazıcısının sayaçlarını döner"""
+    return detection_writer.get_stats()
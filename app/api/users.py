@@ -1,12 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
 from app.database.database import get_db
-from app.crud.user import get_user_by_id, get_all_users, update_user, delete_user
-from app.schemas.user import UserBase, User as UserSchema
+from app.crud.user import get_public_user, get_all_users, update_user, delete_user
+from app.schemas.user import UserBase, User as UserSchema, UserQuota
 from app.core.security import get_current_user
 from app.models.user import User
+from app.api.plaka import fair_scheduler
+from app.utils.response_utils import etag_response
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -15,25 +17,60 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Mevcut kullanıcı bilgilerini getir"""
     return current_user
 
+@router.get("/me/quota", response_model=UserQuota)
+async def get_current_user_quota(current_user: User = Depends(get_current_user)):
+    """Mevcut kullanıcının çıkarım kotalarını ve anlık kullanımını getir"""
+    return fair_scheduler.get_user_status(current_user)
+
 @router.get("/", response_model=List[UserSchema])
-async def get_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Tüm kullanıcıları listele (admin için)"""
-    users = get_all_users(db, skip=skip, limit=limit)
-    return users
+async def get_users(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Tüm kullanıcıları listele (admin için)
+    
+    Sonraki sayfa varsa imleci `X-Next-Cursor` ve `Link` başlıklarında döner.
+    Yanıt ETag taşır; `If-None-Match` eşleşirse 304 döner.
+    
+    Args:
+        limit: Sayfa boyutu
+        cursor: Önceki yanıtın `X-Next-Cursor` değeri
+        skip: Eski offset sayfalaması (cursor verilmişse yok sayılır)
+    """
+    try:
+        users, next_cursor = await get_all_users(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Geçersiz sayfa imleci"
+        )
+    
+    headers = {}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = next_cursor
+        next_url = request.url.remove_query_params("skip").include_query_params(cursor=next_cursor)
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    payload = [UserSchema.model_validate(user).model_dump(mode="json") for user in users]
+    return etag_response(payload, if_none_match, headers)
 
 @router.get("/{user_id}", response_model=UserSchema)
-async def get_user(user_id: str, db: Session = Depends(get_db)):
-    """Belirli bir kullanıcıyı getir"""
-    user = get_user_by_id(db, user_id)
+async def get_user(user_id: str, if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_db)):
+    """Belirli bir kullanıcıyı getir (ETag ile; `If-None-Match` eşleşirse 304 döner)"""
+    user = await get_public_user(db, user_id)
     if user is None:
         raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı")
-    return user
+    return etag_response(UserSchema.model_validate(user).model_dump(mode="json"), if_none_match)
 
 @router.put("/{user_id}", response_model=UserSchema)
 async def update_user_info(
     user_id: str, 
     user_update: UserBase, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Kullanıcı bilgilerini güncelle"""
@@ -41,7 +78,7 @@ async def update_user_info(
     if current_user.id != user_id:
         raise HTTPException(status_code=403, detail="Sadece kendi bilgilerinizi güncelleyebilirsiniz")
     
-    updated_user = update_user(db, user_id, username=user_update.username)
+    updated_user = await update_user(db, user_id, username=user_update.username)
     if updated_user is None:
         raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı")
     return updated_user
@@ -49,7 +86,7 @@ async def update_user_info(
 @router.delete("/{user_id}")
 async def delete_user_account(
     user_id: str, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Kullanıcı hesabını sil"""
@@ -57,7 +94,7 @@ async def delete_user_account(
     if current_user.id != user_id:
         raise HTTPException(status_code=403, detail="Sadece kendi hesabınızı silebilirsiniz")
     
-    success = delete_user(db, user_id)
+    success = await delete_user(db, user_id)
     if not success:
         raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı")
     return {"message": "Kullanıcı başarıyla silindi"}
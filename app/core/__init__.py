@@ -1,11 +1,22 @@
 from .config import settings
-from .security import create_access_token, verify_token, get_current_user, hash_password, verify_password
 
-__all__ = [
-    "settings",
+# security, veritabanı katmanını import ettiği için döngüsel import'u önlemek adına
+# bu isimler ilk erişildiklerinde yüklenir
+_SECURITY_EXPORTS = (
     "create_access_token",
-    "verify_token", 
+    "decode_token",
+    "verify_token",
     "get_current_user",
     "hash_password",
-    "verify_password"
-]
+    "verify_password",
+    "hash_password_async",
+    "verify_password_async",
+)
+
+def __getattr__(name):
+    if name in _SECURITY_EXPORTS:
+        from . import security
+        return getattr(security, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ["settings", *_SECURITY_EXPORTS]
@@ -1,19 +1,31 @@
 from datetime import datetime, timedelta
 from typing import Optional
+import time
 import jwt
 import bcrypt
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.database.database import get_db
 from app.crud.user import get_user_by_email
+from app.models.user import User
 from app.schemas.token import TokenData
 from app.core.config import settings
+from app.utils.ttl_cache import TTLCache
+from app.utils.metrics import Histogram
+from app.utils.tracing import stage
+from app.services.inference_executor import InferenceExecutor
 
 # Security
 security = HTTPBearer()
 
+# Çözülmüş token ve kullanıcı önbellekleri; kayıtlar token'ın exp zamanından sonra yaşamaz
+token_cache = TTLCache(settings.AUTH_CACHE_MAX_ENTRIES)
+user_cache = TTLCache(settings.AUTH_CACHE_MAX_ENTRIES)
+
 # JWT fonksiyonları
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -25,9 +37,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+def decode_token(token: str) -> TokenData:
+    """JWT token'ı çözer ve içindeki kullanıcı bilgisini döner"""
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+    
     try:
-        payload = jwt.decode(credentials.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
             raise HTTPException(
@@ -35,29 +52,137 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
                 detail="Geçersiz token",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        token_data = TokenData(email=email)
+        token_data = TokenData(email=email, exp=payload.get("exp"))
     except jwt.PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Geçersiz token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    token_cache.set(token, token_data, _remaining_lifetime(token_data.exp, settings.TOKEN_CACHE_TTL_SECONDS))
     return token_data
 
-def get_current_user(token_data: TokenData = Depends(verify_token), db: Session = Depends(get_db)):
+def _remaining_lifetime(expires_at: Optional[float], max_ttl: float) -> float:
+    """Önbellek süresini token'ın kalan ömrüyle sınırlar"""
+    if expires_at is None:
+        return max_ttl
+    return min(max_ttl, expires_at - time.time())
+
+def _user_cache_ttl() -> float:
+    """
+    Kullanıcı önbelleği süresi
+
+    Önbellek süreç başınadır; çok süreçli sunumda bir işçide silinen ya da değiştirilen
+    kullanıcı diğer işçilerde bu süre boyunca geçerli kalabileceğinden süre kısaltılır.
+    """
+    if settings.SERVER_WORKERS > 1:
+        return min(settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MULTI_WORKER_TTL_SECONDS)
+    return settings.USER_CACHE_TTL_SECONDS
+
+def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    return decode_token(credentials.credentials)
+
+async def get_current_user(token_data: TokenData = Depends(verify_token), db: AsyncSession = Depends(get_db)):
     email = token_data.email
-    user = get_user_by_email(db, email)
+    # Sık gelen isteklerde veritabanı sorgusunu atla
+    user_cache_ttl = _user_cache_ttl()
+    user = user_cache.get(email) if user_cache_ttl > 0 else None
+    if user is not None:
+        return user
+    
+    with stage("user_lookup"):
+        user = await get_user_by_email(db, email)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Kullanıcı bulunamadı",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    # Oturum kapandıktan sonra da okunabilmesi için nesne oturumdan ayrılır
+    db.expunge(user)
+    # Bağlantıyı havuza iade et; uzun süren çıkarım boyunca bağlantı tutulmaz.
+    # Aynı oturum istek içinde tekrar kullanılırsa yeni bir bağlantı alınır.
+    await db.close()
+    if user_cache_ttl > 0:
+        user_cache.set(email, user, _remaining_lifetime(token_data.exp, user_cache_ttl))
     return user
 
+async def require_model_admin(current_user: User = Depends(get_current_user)):
+    """Model kaydını değiştiren uç noktalar için `MODEL_ADMIN_EMAILS` listesindeki kullanıcıları kabul eder"""
+    admins = {email.strip().lower() for email in settings.MODEL_ADMIN_EMAILS}
+    if current_user.email.lower() not in admins:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Bu işlem için model yöneticisi yetkisi gerekli",
+        )
+    return current_user
+
+def invalidate_user_cache(user_id: str):
+    """Belirli bir kullanıcının önbellekteki kayıtlarını siler"""
+    user_cache.remove_where(lambda cached_user: cached_user.id == user_id)
+
+# update_user/delete_user gibi değişiklikler commit edildiğinde önbellek temizlenir
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_changed(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+    invalidate_user_cache(target.id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate_user_cache(user_id)
+
+# bcrypt bilerek yavaştır; event loop'u bloklamaması için ayrı, sınırlı bir havuzda çalışır
+password_executor = InferenceExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    thread_name_prefix="bcrypt"
+)
+_LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500]
+password_latency = {
+    "hash": Histogram("password_hash_latency_ms", _LATENCY_BUCKETS_MS, "bcrypt hash süresi (ms)"),
+    "verify": Histogram("password_verify_latency_ms", _LATENCY_BUCKETS_MS, "bcrypt doğrulama süresi (ms)"),
+}
+
 # Şifre hash'leme fonksiyonu
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode('utf-8')
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Hash'in maliyet faktörü ayarlardakinden farklıysa True döner"""
+    try:
+        # Biçim: $2b$<maliyet>$<salt+hash>
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+def _timed(operation: str, func, *args):
+    started_at = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        password_latency[operation].observe((time.perf_counter() - started_at) * 1000.0)
+
+async def hash_password_async(password: str) -> str:
+    """Şifreyi bcrypt havuzunda hash'ler"""
+    return await password_executor.run(_timed, "hash", hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Şifreyi bcrypt havuzunda doğrular"""
+    return await password_executor.run(_timed, "verify", verify_password, plain_password, hashed_password)
+
+def get_password_metrics():
+    """bcrypt havuzu durumunu ve işlem süresi histogramlarını döner"""
+    return {
+        "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+        "executor": password_executor.get_status(),
+        "latency_ms": {name: histogram.snapshot() for name, histogram in password_latency.items()},
+    }
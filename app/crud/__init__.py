@@ -2,16 +2,24 @@ from .user import (
     get_user_by_email,
     get_user_by_id,
     create_user,
+    get_public_user,
     get_all_users,
     update_user,
     delete_user
 )
+from .detection import get_detections
+from .job import create_job, get_job, get_user_jobs
 
 __all__ = [
     "get_user_by_email",
     "get_user_by_id", 
     "create_user",
+    "get_public_user",
     "get_all_users",
     "update_user",
-    "delete_user"
+    "delete_user",
+    "get_detections",
+    "create_job",
+    "get_job",
+    "get_user_jobs"
 ]
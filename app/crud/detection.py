@@ -0,0 +1,58 @@
+import base64
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+from sqlalchemy import select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.detection import Detection
+
+def encode_cursor(created_at: datetime, record_id) -> str:
+    """Son kaydın (created_at, id) değerlerinden sayfa imleci üretir"""
+    raw = f"{created_at.isoformat()}|{record_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str, id_type: Callable = int) -> Tuple[datetime, object]:
+    """Sayfa imlecini (created_at, id) değerlerine çevirir; id `id_type` ile dönüştürülür"""
+    raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    created_at, record_id = raw.rsplit("|", 1)
+    return datetime.fromisoformat(created_at), id_type(record_id)
+
+async def get_detections(
+    db: AsyncSession,
+    user_id: str,
+    source: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+):
+    """
+    Kullanıcının tespitlerini yeniden eskiye keyset sayfalama ile getir
+
+    Returns:
+        Tuple: (tespit listesi, sonraki sayfa imleci ya da None)
+    """
+    query = select(Detection).where(Detection.user_id == user_id)
+    if source is not None:
+        query = query.where(Detection.source == source)
+    if since is not None:
+        query = query.where(Detection.created_at >= since)
+    if until is not None:
+        query = query.where(Detection.created_at < until)
+    if cursor is not None:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        # OFFSET yerine son görülen kaydın ardından devam edilir
+        query = query.where(or_(
+            Detection.created_at < cursor_created_at,
+            and_(Detection.created_at == cursor_created_at, Detection.id < cursor_id),
+        ))
+
+    query = query.order_by(Detection.created_at.desc(), Detection.id.desc()).limit(limit + 1)
+    result = await db.execute(query)
+    detections = result.scalars().all()
+
+    next_cursor = None
+    if len(detections) > limit:
+        detections = detections[:limit]
+        last = detections[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return detections, next_cursor
@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.job import Job
+
+async def create_job(db: AsyncSession, job_id: str, user_id: str, input_path: str, kind: str = "detect",
+                     confidence: float = 0.75, priority: int = 0, max_attempts: int = 3,
+                     source: Optional[str] = None, callback_url: Optional[str] = None):
+    """Yeni iş oluştur"""
+    db_job = Job(
+        id=job_id,
+        user_id=user_id,
+        status="queued",
+        kind=kind,
+        priority=priority,
+        confidence=confidence,
+        source=source,
+        input_path=input_path,
+        max_attempts=max_attempts,
+        callback_url=callback_url,
+        available_at=datetime.now(timezone.utc)
+    )
+    db.add(db_job)
+    await db.commit()
+    await db.refresh(db_job)
+    return db_job
+
+async def get_job(db: AsyncSession, job_id: str, user_id: str):
+    """Kullanıcıya ait işi getir"""
+    result = await db.execute(select(Job).where(Job.id == job_id, Job.user_id == user_id))
+    return result.scalars().first()
+
+async def get_user_jobs(db: AsyncSession, user_id: str, status: Optional[str] = None, limit: int = 100):
+    """Kullanıcının işlerini yeniden eskiye getir"""
+    query = select(Job).where(Job.user_id == user_id)
+    if status is not None:
+        query = query.where(Job.status == status)
+    result = await db.execute(query.order_by(Job.created_at.desc()).limit(limit))
+    return result.scalars().all()
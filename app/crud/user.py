@@ -1,16 +1,29 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.models.user import User
+from app.crud.detection import encode_cursor, decode_cursor
 import uuid
 
-def get_user_by_email(db: Session, email: str):
+# UserSchema'nın ihtiyaç duyduğu sütunlar; hashed_password ve kota alanları okunmaz
+PUBLIC_COLUMNS = (User.id, User.email, User.username, User.is_active, User.created_at)
+
+async def get_user_by_email(db: AsyncSession, email: str):
     """Email ile kullanıcı getir"""
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
 
-def get_user_by_id(db: Session, user_id: str):
+async def get_user_by_id(db: AsyncSession, user_id: str):
     """ID ile kullanıcı getir"""
-    return db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalars().first()
+
+async def get_public_user(db: AsyncSession, user_id: str):
+    """ID ile kullanıcının yalnızca herkese açık sütunlarını getir (ORM nesnesi oluşturulmaz)"""
+    result = await db.execute(select(*PUBLIC_COLUMNS).where(User.id == user_id))
+    return result.first()
 
-def create_user(db: Session, email: str, username: str, hashed_password: str):
+async def create_user(db: AsyncSession, email: str, username: str, hashed_password: str):
     """Yeni kullanıcı oluştur"""
     user_id = str(uuid.uuid4())
     db_user = User(
@@ -20,30 +33,58 @@ def create_user(db: Session, email: str, username: str, hashed_password: str):
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
-def get_all_users(db: Session, skip: int = 0, limit: int = 100):
-    """Tüm kullanıcıları getir"""
-    return db.query(User).offset(skip).limit(limit).all()
+async def get_all_users(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    """
+    Kullanıcıları eskiden yeniye (created_at, id) keyset sayfalama ile getir
+    
+    Yalnızca herkese açık sütunlar seçilir. `skip` geriye dönük uyumluluk içindir;
+    derin sayfalarda atlanan satırlar yine taranır, `cursor` tercih edilmelidir.
+    
+    Returns:
+        Tuple: (kullanıcı satırları, sonraki sayfa imleci ya da None)
+    """
+    # İmleç created_at değerinden üretildiği için boş created_at'li (eski) satırlar sayfalanamaz
+    query = select(*PUBLIC_COLUMNS).where(User.created_at.isnot(None))
+    if cursor is not None:
+        cursor_created_at, cursor_id = decode_cursor(cursor, str)
+        query = query.where(or_(
+            User.created_at > cursor_created_at,
+            and_(User.created_at == cursor_created_at, User.id > cursor_id),
+        ))
+    elif skip:
+        query = query.offset(skip)
+    
+    query = query.order_by(User.created_at, User.id).limit(limit + 1)
+    result = await db.execute(query)
+    users = result.all()
+    
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        last = users[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return users, next_cursor
 
-def update_user(db: Session, user_id: str, **kwargs):
+async def update_user(db: AsyncSession, user_id: str, **kwargs):
     """Kullanıcı bilgilerini güncelle"""
-    db_user = get_user_by_id(db, user_id)
+    db_user = await get_user_by_id(db, user_id)
     if db_user:
         for key, value in kwargs.items():
             if hasattr(db_user, key):
                 setattr(db_user, key, value)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
     return db_user
 
-def delete_user(db: Session, user_id: str):
+async def delete_user(db: AsyncSession, user_id: str):
     """Kullanıcı sil"""
-    db_user = get_user_by_id(db, user_id)
+    db_user = await get_user_by_id(db, user_id)
     if db_user:
-        db.delete(db_user)
-        db.commit()
+        await db.delete(db_user)
+        await db.commit()
         return True
     return False
@@ -1,3 +1,5 @@
 from .user import User
+from .detection import Detection
+from .job import Job
 
-__all__ = ["User"]
+__all__ = ["User", "Detection", "Job"]
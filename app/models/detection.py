@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Float, DateTime, BigInteger, Integer, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database.database import Base
+
+class Detection(Base):
+    __tablename__ = "detections"
+
+    # SQLite yalnızca INTEGER birincil anahtarlarda otomatik artış yapar
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    source = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    x1 = Column(Float, nullable=False)
+    y1 = Column(Float, nullable=False)
+    x2 = Column(Float, nullable=False)
+    y2 = Column(Float, nullable=False)
+    confidence = Column(Float, nullable=False)
+    model_version = Column(String, nullable=True)
+
+    __table_args__ = (
+        # Keyset sayfalama (created_at, id) sırasıyla yapılır
+        Index("ix_detections_user_created", "user_id", "created_at", "id"),
+        Index("ix_detections_source_created", "source", "created_at", "id"),
+        Index("ix_detections_created", "created_at", "id"),
+    )
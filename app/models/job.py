@@ -0,0 +1,36 @@
+from sqlalchemy import Column, String, Integer, Float, Text, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database.database import Base
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True)
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # queued, running, succeeded, failed
+    status = Column(String, nullable=False, default="queued")
+    # detect (yalnızca JSON) veya detect-image (JSON + işaretlenmiş görüntü)
+    kind = Column(String, nullable=False, default="detect")
+    priority = Column(Integer, nullable=False, default=0)
+    confidence = Column(Float, nullable=False, default=0.75)
+    source = Column(String, nullable=True)
+    input_path = Column(String, nullable=False)
+    result_json = Column(Text, nullable=True)
+    result_image_path = Column(String, nullable=True)
+    result_media_type = Column(String, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    callback_url = Column(String, nullable=True)
+    callback_status = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    available_at = Column(DateTime(timezone=True), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    # Çalışan işin sahibi olan işçi bunu düzenli olarak yeniler; süresi dolan işler kuyruğa geri alınır
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Sıradaki işi seçen sorgu için
+        Index("ix_jobs_status_priority", "status", "priority", "available_at"),
+    )
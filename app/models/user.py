@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Boolean, DateTime
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Boolean, DateTime, Float, Integer, Index
 from sqlalchemy.sql import func
 from app.database.database import Base
 
@@ -10,5 +11,18 @@ class User(Base):
     username = Column(String, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Çıkarım kotaları; boş bırakılırsa QUOTA_DEFAULT_* ayarları kullanılır
+    quota_weight = Column(Float, nullable=True)
+    quota_rate = Column(Float, nullable=True)
+    quota_burst = Column(Integer, nullable=True)
+    quota_concurrency = Column(Integer, nullable=True)
+    # Keyset imleci mikrosaniye hassasiyetinde olduğundan değer Python'da atanır; SQLite'ın
+    # CURRENT_TIMESTAMP'ı saniye hassasiyetindedir ve aynı saniyedeki kullanıcılar sayfalar arasında kaybolur
+    created_at = Column(DateTime(timezone=True), nullable=False,
+                        default=lambda: datetime.now(timezone.utc), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # Kullanıcı listesi (created_at, id) sırasıyla keyset sayfalama ile okunur
+        Index("ix_users_created", "created_at", "id"),
+    )
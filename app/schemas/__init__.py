@@ -1,9 +1,13 @@
-from .user import UserBase, UserCreate, UserLogin, User as UserSchema
+from .user import UserBase, UserCreate, UserLogin, User as UserSchema, UserQuota
 from .token import Token, TokenData
-from .plaka import PlakaDetection, PlakaResponse
+from .detection import DetectionRecord, DetectionPage
+from .job import JobStatus
+from .plaka import PlakaDetection, PlakaResponse, PlakaBatchItem, PlakaTrack, PlakaVideoResponse
 
 __all__ = [
-    "UserBase", "UserCreate", "UserLogin", "UserSchema",
+    "UserBase", "UserCreate", "UserLogin", "UserSchema", "UserQuota",
     "Token", "TokenData",
-    "PlakaDetection", "PlakaResponse"
+    "DetectionRecord", "DetectionPage",
+    "JobStatus",
+    "PlakaDetection", "PlakaResponse", "PlakaBatchItem", "PlakaTrack", "PlakaVideoResponse"
 ]
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class DetectionRecord(BaseModel):
+    id: int
+    user_id: str
+    source: Optional[str] = None
+    created_at: datetime
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    confidence: float
+    model_version: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class DetectionPage(BaseModel):
+    items: List[DetectionRecord]
+    next_cursor: Optional[str] = None
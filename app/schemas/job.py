@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class JobStatus(BaseModel):
+    id: str
+    status: str
+    kind: str
+    priority: int
+    attempts: int
+    max_attempts: int
+    source: Optional[str] = None
+    error: Optional[str] = None
+    callback_url: Optional[str] = None
+    callback_status: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
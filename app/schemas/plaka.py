@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 class PlakaDetection(BaseModel):
     x1: float
@@ -7,8 +7,34 @@ class PlakaDetection(BaseModel):
     x2: float
     y2: float
     confidence: float
+    plate_text: Optional[str] = None
+    char_confidences: Optional[List[float]] = None
 
 class PlakaResponse(BaseModel):
     detections: List[PlakaDetection]
     total_detections: int
     message: str
+
+class PlakaBatchItem(BaseModel):
+    index: int
+    filename: str
+    result: Optional[PlakaResponse] = None
+    error: Optional[str] = None
+
+class PlakaTrack(BaseModel):
+    track_id: int
+    first_frame: int
+    last_frame: int
+    best_frame: int
+    first_time: Optional[float] = None
+    last_time: Optional[float] = None
+    hits: int
+    detection: PlakaDetection
+
+class PlakaVideoResponse(BaseModel):
+    tracks: List[PlakaTrack]
+    total_tracks: int
+    frames_read: int
+    frames_processed: int
+    fps: float
+    message: str
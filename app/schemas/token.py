@@ -7,3 +7,4 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    exp: Optional[float] = None
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
+from typing import Dict
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -19,3 +20,14 @@ class User(UserBase):
 
     class Config:
         from_attributes = True
+
+class UserQuota(BaseModel):
+    weight: float
+    rate: float
+    burst: int
+    concurrency: int
+    tokens: float
+    queued: int
+    active: int
+    admitted: int
+    throttled: Dict[str, int]
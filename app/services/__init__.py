@@ -1,3 +1,29 @@
 from .plaka_service import PlakaService
+from .model_registry import ModelRegistry
+from .inference_backends import InferenceBackend, create_backend
+from .inference_executor import InferenceExecutor
+from .batch_scheduler import MicroBatcher
+from .fair_scheduler import FairScheduler
+from .tiling import TileOptions
+from .detection_cache import DetectionCache
+from .plate_tracker import IoUTracker
+from .video_service import MotionGate, VideoFrameReader
+from .detection_writer import DetectionWriter
+from .job_queue import JobQueue
 
-__all__ = ["PlakaService"]
+__all__ = [
+    "PlakaService",
+    "ModelRegistry",
+    "InferenceBackend",
+    "create_backend",
+    "InferenceExecutor",
+    "MicroBatcher",
+    "FairScheduler",
+    "TileOptions",
+    "DetectionCache",
+    "IoUTracker",
+    "MotionGate",
+    "VideoFrameReader",
+    "DetectionWriter",
+    "JobQueue"
+]
@@ -0,0 +1,138 @@
+import asyncio
+import time
+from typing import List, Optional
+import numpy as np
+from app.core.config import settings
+from app.services.inference_executor import InferenceExecutor, service_unavailable
+from app.utils.metrics import Histogram
+
+class _BatchItem:
+    __slots__ = ("image", "confidence", "model", "future", "enqueued_at")
+
+    def __init__(self, image: np.ndarray, confidence: float, model: Optional[str], future: asyncio.Future):
+        self.image = image
+        self.confidence = confidence
+        self.model = model
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+class MicroBatcher:
+    """
+    Eşzamanlı tekil tespit isteklerini toplayıp tek bir toplu tahmin olarak çalıştırır
+
+    Kuyruktaki görüntüler en fazla `max_wait_ms` milisaniye ya da `max_batch_size`
+    adede ulaşana kadar beklenir, ardından `PlakaService.detect_plates_batch` ile
+    işlenir ve her çağırana kendi sonucu iletilir.
+    """
+
+    def __init__(self, plaka_service, executor: InferenceExecutor,
+                 max_batch_size: int = None, max_wait_ms: float = None, enabled: bool = None):
+        self.plaka_service = plaka_service
+        self.executor = executor
+        self.max_batch_size = max_batch_size or settings.BATCH_MAX_SIZE
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else settings.BATCH_MAX_WAIT_MS
+        self.enabled = settings.BATCHING_ENABLED if enabled is None else enabled
+        self.max_queue_size = self.executor.max_queue_size * self.max_batch_size
+        self._queue: asyncio.Queue = None
+        self._worker_task: asyncio.Task = None
+        self._slots: asyncio.Semaphore = None
+        self.batch_size_histogram = Histogram(
+            "plaka_batch_size",
+            buckets=[1, 2, 4, 8, 16, 32, 64],
+            description="Toplu tahmin başına görüntü sayısı",
+        )
+        self.queue_wait_histogram = Histogram(
+            "plaka_batch_queue_wait_ms",
+            buckets=[1, 2, 5, 10, 25, 50, 100, 250, 500, 1000],
+            description="Görüntünün toplu tahmine girene kadar kuyrukta beklediği süre (ms)",
+        )
+
+    def _ensure_worker(self):
+        """Arka plan toplayıcı görevini ilk istekte başlatır"""
+        if self._worker_task is None or self._worker_task.done():
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._slots = asyncio.Semaphore(self.executor.max_workers)
+            self._worker_task = asyncio.get_running_loop().create_task(self._collect_loop())
+
+    async def submit(self, image: np.ndarray, confidence: float, model: Optional[str] = None):
+        """
+        Görüntüyü kuyruğa ekler ve tespit sonucunu bekler
+        
+        Args:
+            image: OpenCV formatında görüntü
+            confidence: Güven eşiği
+            model: Kayıttaki model adı (varsayılan: aktif model)
+
+        Returns:
+            np.ndarray: (N, 5) boyutlu kutu dizisi
+        """
+        if not self.enabled:
+            return await self.executor.run(self.plaka_service.detect_plates, image, confidence, model)
+
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait(_BatchItem(image, confidence, model, future))
+        except asyncio.QueueFull:
+            raise service_unavailable(self.executor.retry_after)
+        return await future
+
+    async def _collect_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Boşta bir işçi olana kadar beklerken kuyruk birikir, böylece batch büyür
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000.0
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            loop.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[_BatchItem]):
+        try:
+            started_at = time.perf_counter()
+            self.batch_size_histogram.observe(len(batch))
+            for item in batch:
+                self.queue_wait_histogram.observe((started_at - item.enqueued_at) * 1000.0)
+
+            # A/B yönlendirmesinde aynı batch farklı modellere gidebilir; her model kendi grubunu çalıştırır
+            groups = {}
+            for item in batch:
+                groups.setdefault(item.model, []).append(item)
+
+            for model, items in groups.items():
+                try:
+                    results = await self.executor.run(
+                        self.plaka_service.detect_plates_batch,
+                        [item.image for item in items],
+                        [item.confidence for item in items],
+                        model,
+                    )
+                except Exception as e:
+                    for item in items:
+                        if not item.future.done():
+                            item.future.set_exception(e)
+                    continue
+
+                for item, result in zip(items, results):
+                    if not item.future.done():
+                        item.future.set_result(result)
+        finally:
+            self._slots.release()
+
+    def get_stats(self):
+        """Batch boyutu ve kuyruk bekleme histogramlarını döner"""
+        return {
+            "enabled": self.enabled,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batch_size": self.batch_size_histogram.snapshot(),
+            "queue_wait_ms": self.queue_wait_histogram.snapshot(),
+        }
@@ -0,0 +1,146 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+import numpy as np
+from app.core.config import settings
+from app.services.plaka_service import PlakaService
+
+class DetectionCache:
+    """
+    Yüklenen görüntü baytlarının özetine göre tespit sonuçlarını saklayan LRU/TTL önbellek
+
+    Kutular istenen eşikle değil `base_threshold` ile saklanır; böylece aynı görüntü
+    daha yüksek bir güven eşiğiyle tekrar gelirse model çalıştırılmadan maskeleme
+    ile cevaplanabilir.
+    """
+
+    def __init__(self, max_entries: int = None, ttl_seconds: float = None,
+                 base_confidence: float = None, disk_dir: Optional[str] = None):
+        self.max_entries = max_entries if max_entries is not None else settings.CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.CACHE_TTL_SECONDS
+        self.base_confidence = base_confidence if base_confidence is not None else settings.CACHE_BASE_CONFIDENCE
+        self.disk_dir = disk_dir if disk_dir is not None else settings.CACHE_DISK_DIR
+        self.enabled = settings.CACHE_ENABLED and self.max_entries > 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(contents: bytes, model_version: str) -> str:
+        """Görüntü baytları ve model sürümünden önbellek anahtarı üretir"""
+        digest = hashlib.blake2b(contents, digest_size=16)
+        digest.update(model_version.encode("utf-8"))
+        return digest.hexdigest()
+
+    def base_threshold(self, confidence: float) -> float:
+        """Modelin çalıştırılacağı (saklanacak) eşiği döner"""
+        return min(confidence, self.base_confidence)
+
+    def get(self, key: str, confidence: float) -> Optional[np.ndarray]:
+        """
+        Önbellekteki kutuları istenen eşiğe göre filtreleyip döner
+
+        Returns:
+            np.ndarray: (N, 5) kutu dizisi; kayıt yoksa ya da eşik karşılanamıyorsa None
+        """
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                boxes, threshold, expires_at = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    self.evictions += 1
+                    entry = None
+                elif confidence >= threshold:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return PlakaService.filter_boxes(boxes, confidence)
+
+        if entry is None and self.disk_dir:
+            loaded = self._load_from_disk(key)
+            if loaded is not None:
+                boxes, threshold = loaded
+                if confidence >= threshold:
+                    self._store(key, boxes, threshold)
+                    with self._lock:
+                        self.hits += 1
+                        self.disk_hits += 1
+                    return PlakaService.filter_boxes(boxes, confidence)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, boxes: np.ndarray, threshold: float):
+        """Modelin `threshold` eşiğiyle ürettiği kutuları saklar"""
+        if not self.enabled:
+            return
+        self._store(key, boxes, threshold)
+        if self.disk_dir:
+            self._save_to_disk(key, boxes, threshold)
+
+    def _store(self, key: str, boxes: np.ndarray, threshold: float):
+        boxes.setflags(write=False)
+        with self._lock:
+            self._entries[key] = (boxes, threshold, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.npz")
+
+    def _load_from_disk(self, key: str):
+        path = self._disk_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                os.remove(path)
+                return None
+            with np.load(path) as data:
+                return data["boxes"], float(data["threshold"])
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _save_to_disk(self, key: str, boxes: np.ndarray, threshold: float):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(f, boxes=boxes, threshold=threshold)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Önbellek diske yazılamadı: {e}")
+
+    def clear(self):
+        """Bellekteki tüm kayıtları siler"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """İsabet, ıskalama ve tahliye sayaçlarını döner"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "base_confidence": self.base_confidence,
+                "disk_dir": self.disk_dir,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_hits": self.disk_hits,
+            }
@@ -0,0 +1,117 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Optional
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.database.database import engine
+from app.models.detection import Detection
+
+class DetectionWriter:
+    """
+    Tespit satırlarını bellekte biriktirip arka planda toplu INSERT (executemany) ile yazar
+
+    İstek yolu yalnızca `enqueue` çağırır ve hiçbir zaman veritabanını beklemez;
+    tampon doluysa satırlar düşürülür ve sayaçta gösterilir.
+    """
+
+    def __init__(self, batch_size: int = None, flush_interval: float = None, max_buffer: int = None):
+        self.batch_size = batch_size or settings.DETECTION_WRITE_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.DETECTION_FLUSH_INTERVAL
+        self.max_buffer = max_buffer or settings.DETECTION_MAX_BUFFER
+        self.enabled = settings.DETECTION_PERSIST_ENABLED
+        self._buffer: List[dict] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+
+    def enqueue(self, user_id: str, boxes: np.ndarray, source: Optional[str] = None, model_version: Optional[str] = None):
+        """Bir görüntünün kutularını yazma tamponuna ekler"""
+        if not self.enabled or len(boxes) == 0:
+            return
+        if len(self._buffer) + len(boxes) > self.max_buffer:
+            self.dropped += len(boxes)
+            return
+
+        created_at = datetime.now(timezone.utc)
+        keys = ("x1", "y1", "x2", "y2", "confidence")
+        for row in boxes.astype(np.float64).tolist():
+            record = dict(zip(keys, row))
+            record.update(user_id=user_id, source=source, created_at=created_at, model_version=model_version)
+            self._buffer.append(record)
+
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self):
+        """Arka plan yazma görevini başlatır"""
+        if not self.enabled or self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Görevi durdurur ve tampondaki satırları yazar"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Tampondaki satırları batch_size'lık gruplar halinde yazar"""
+        rows, self._buffer = self._buffer, []
+        for start in range(0, len(rows), self.batch_size):
+            await self._write(rows[start:start + self.batch_size])
+
+    async def _write(self, chunk: List[dict]):
+        """
+        Grubu tek INSERT ile yazar; bütünlük hatasında grubu ikiye bölerek tekrar dener
+
+        Arada silinen bir kullanıcının satırı (yabancı anahtar hatası) böylece yalnızca
+        kendisini düşürür, gruptaki diğer satırlar yazılır.
+        """
+        try:
+            async with engine.begin() as connection:
+                await connection.execute(insert(Detection), chunk)
+        except IntegrityError as e:
+            if len(chunk) == 1:
+                self.failed += 1
+                print(f"Tespit satırı yazılamadı (kullanıcı silinmiş olabilir): {e.orig}")
+                return
+            middle = len(chunk) // 2
+            await self._write(chunk[:middle])
+            await self._write(chunk[middle:])
+            return
+        except Exception as e:
+            self.failed += len(chunk)
+            print(f"Tespitler veritabanına yazılamadı: {e}")
+            return
+        self.written += len(chunk)
+        self.flushes += 1
+
+    def get_stats(self):
+        return {
+            "enabled": self.enabled,
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": self.flushes,
+        }
@@ -0,0 +1,285 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.utils.metrics import REGISTRY, Counter, Gauge, MetricFamily
+
+USER_QUEUE_DEPTH = REGISTRY.register(MetricFamily(
+    lambda: Gauge("plaka_user_queue_depth"),
+    "plaka_user_queue_depth",
+    "Kullanıcı başına çıkarım sırası bekleyen istek sayısı",
+    ("user",),
+))
+
+USER_IN_FLIGHT = REGISTRY.register(MetricFamily(
+    lambda: Gauge("plaka_user_in_flight"),
+    "plaka_user_in_flight",
+    "Kullanıcı başına çıkarımda olan istek sayısı",
+    ("user",),
+))
+
+USER_ADMITTED = REGISTRY.register(MetricFamily(
+    lambda: Counter("plaka_user_admitted_total"),
+    "plaka_user_admitted_total",
+    "Kullanıcı başına çıkarıma alınan istek sayısı",
+    ("user",),
+))
+
+USER_THROTTLED = REGISTRY.register(MetricFamily(
+    lambda: Counter("plaka_user_throttled_total"),
+    "plaka_user_throttled_total",
+    "Kota nedeniyle reddedilen ya da bekletilen istek sayısı (rate, concurrency, queue_full)",
+    ("user", "reason"),
+))
+
+# Boştaki kullanıcı durumlarının temizlenme aralığı (saniye)
+_PRUNE_INTERVAL = 60.0
+
+def too_many_requests(detail: str, retry_after: int) -> HTTPException:
+    """Kullanıcı kotası aşıldığında dönülecek 429 hatasını oluşturur"""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(retry_after, 1))},
+    )
+
+class _UserState:
+    """Tek bir kullanıcının kuyruğu, token kovası ve sayaçları"""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.weight = settings.QUOTA_DEFAULT_WEIGHT
+        self.rate = settings.QUOTA_DEFAULT_RATE
+        self.burst = settings.QUOTA_DEFAULT_BURST
+        self.concurrency = settings.QUOTA_DEFAULT_CONCURRENCY
+        self.tokens = float(self.burst)
+        self.refilled_at = time.monotonic()
+        # (bitiş etiketi, future) çiftleri; kullanıcı içinde sıra FIFO'dur
+        self.waiters: deque = deque()
+        self.active = 0
+        self.last_finish = 0.0
+        self.admitted = 0
+        self.throttled = {"rate": 0, "concurrency": 0, "queue_full": 0}
+
+    def configure(self, user):
+        """
+        Kullanıcı kaydındaki kotaları uygular; boş alanlar için varsayılanlar kullanılır
+
+        rate ve concurrency için 0 ya da negatif değer sınırsız demektir; rate sınırlıyken
+        burst en az 1'e yükseltilir, aksi halde kovada hiçbir zaman tam bir token birikmez.
+        """
+        weight = getattr(user, "quota_weight", None)
+        rate = getattr(user, "quota_rate", None)
+        burst = getattr(user, "quota_burst", None)
+        concurrency = getattr(user, "quota_concurrency", None)
+        self.weight = weight if weight and weight > 0 else settings.QUOTA_DEFAULT_WEIGHT
+        self.rate = rate if rate is not None else settings.QUOTA_DEFAULT_RATE
+        burst = burst if burst is not None else settings.QUOTA_DEFAULT_BURST
+        self.burst = max(burst, 1) if self.rate > 0 else burst
+        concurrency = concurrency if concurrency is not None else settings.QUOTA_DEFAULT_CONCURRENCY
+        self.concurrency = max(concurrency, 0)
+
+    @property
+    def has_capacity(self) -> bool:
+        """Eşzamanlılık kotası dolmamış mı (0 sınırsız)"""
+        return self.concurrency <= 0 or self.active < self.concurrency
+
+    def refill(self, now: float):
+        if self.rate > 0:
+            self.tokens = min(float(self.burst), self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+    def take_token(self) -> float:
+        """Kovadan bir token alır; yeterli token yoksa beklenmesi gereken süreyi döner"""
+        if self.rate <= 0:
+            return 0.0
+        self.refill(time.monotonic())
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    @property
+    def idle(self) -> bool:
+        return not self.waiters and self.active == 0 and (self.rate <= 0 or self.tokens >= self.burst)
+
+    def get_status(self) -> dict:
+        return {
+            "weight": self.weight,
+            "rate": self.rate,
+            "burst": self.burst,
+            "concurrency": self.concurrency,
+            "tokens": round(self.tokens, 2),
+            "queued": len(self.waiters),
+            "active": self.active,
+            "admitted": self.admitted,
+            "throttled": dict(self.throttled),
+        }
+
+class FairScheduler:
+    """
+    Çıkarım isteklerini kullanıcı başına kuyruklarda tutup ağırlıklı adil sıralama ile
+    çıkarıma alır
+
+    Her kullanıcının isteği, kullanıcının ağırlığıyla ters orantılı bir bitiş etiketi
+    alır (self-clocked fair queuing); boşalan her yerde en küçük etiketli istek
+    çalışır. Böylece toplu yükleme yapan bir kullanıcının yüzlerce isteği, diğer
+    kullanıcıların tekil isteklerinin önüne geçemez. Ayrıca kullanıcı başına token
+    kovası (istek/sn ve ani yük) ve eşzamanlı istek kotası uygulanır.
+
+    Aşağı akıştaki mikro-batch kuyruğu FIFO olduğu için sıralama burada yapılır;
+    aynı anda en fazla `max_in_flight` istek çıkarıma bırakılır.
+    """
+
+    def __init__(self, max_in_flight: int = None, max_queued_per_user: int = None, enabled: bool = None):
+        self.enabled = settings.QUOTA_ENABLED if enabled is None else enabled
+        self.max_in_flight = max_in_flight or settings.QUOTA_MAX_IN_FLIGHT or settings.INFERENCE_WORKERS * settings.BATCH_MAX_SIZE
+        self.max_queued_per_user = max_queued_per_user or settings.QUOTA_MAX_QUEUED_PER_USER
+        self._users: Dict[str, _UserState] = {}
+        self._in_flight = 0
+        self._virtual_time = 0.0
+        self._pruned_at = time.monotonic()
+
+    def _state(self, user) -> _UserState:
+        state = self._users.get(user.id)
+        if state is None:
+            state = self._users[user.id] = _UserState(user.id)
+        # Kota değişiklikleri kullanıcı önbelleği yenilendiğinde uygulanır
+        state.configure(user)
+        return state
+
+    def _throttle(self, state: _UserState, reason: str):
+        state.throttled[reason] += 1
+        USER_THROTTLED.labels(state.user_id, reason).inc()
+
+    def _update_gauges(self, state: _UserState):
+        USER_QUEUE_DEPTH.labels(state.user_id).set(len(state.waiters))
+        USER_IN_FLIGHT.labels(state.user_id).set(state.active)
+
+    @asynccontextmanager
+    async def slot(self, user, wait: bool = False):
+        """
+        Kullanıcının sırası gelene kadar bekler, blok bitince yeri bırakır
+
+        Args:
+            user: `get_current_user` ile çözülen kullanıcı
+            wait: True ise token kovası boşken 429 yerine token dolana kadar beklenir
+                (toplu yüklemelerde görüntüler kullanıcının hızına göre sıralanır)
+        """
+        if not self.enabled:
+            yield
+            return
+
+        state = self._state(user)
+        delay = state.take_token()
+        if delay > 0:
+            self._throttle(state, "rate")
+            if not wait:
+                raise too_many_requests("İstek hızı sınırı aşıldı, lütfen daha sonra tekrar deneyin", math.ceil(delay))
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = state.take_token()
+
+        if len(state.waiters) >= self.max_queued_per_user:
+            self._throttle(state, "queue_full")
+            if state.rate > 0:
+                state.tokens += 1.0
+            raise too_many_requests("Bekleyen istek sınırı aşıldı, lütfen daha sonra tekrar deneyin",
+                                    settings.INFERENCE_RETRY_AFTER)
+        if not state.has_capacity:
+            self._throttle(state, "concurrency")
+
+        # Kullanıcı boştaysa sanal saatten, değilse kendi son etiketinden devam eder
+        start = max(self._virtual_time, state.last_finish)
+        state.last_finish = start + 1.0 / state.weight
+        future = asyncio.get_running_loop().create_future()
+        state.waiters.append((state.last_finish, future))
+        self._dispatch()
+        self._update_gauges(state)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Yer verildikten hemen sonra istemci koptu
+                self._release(state)
+            else:
+                self._discard(state, future)
+            raise
+
+        try:
+            yield
+        finally:
+            self._release(state)
+
+    def _dispatch(self):
+        """Boş yer kaldıkça en küçük bitiş etiketli, eşzamanlılık kotası dolmamış isteği başlatır"""
+        while self._in_flight < self.max_in_flight:
+            best = None
+            for state in self._users.values():
+                waiters = state.waiters
+                while waiters and waiters[0][1].done():
+                    waiters.popleft()
+                if waiters and state.has_capacity:
+                    if best is None or waiters[0][0] < best.waiters[0][0]:
+                        best = state
+            if best is None:
+                return
+            finish, future = best.waiters.popleft()
+            best.active += 1
+            best.admitted += 1
+            self._in_flight += 1
+            self._virtual_time = max(self._virtual_time, finish)
+            USER_ADMITTED.labels(best.user_id).inc()
+            self._update_gauges(best)
+            future.set_result(None)
+
+    def _discard(self, state: _UserState, future: asyncio.Future):
+        try:
+            state.waiters.remove(next(item for item in state.waiters if item[1] is future))
+        except StopIteration:
+            pass
+        self._update_gauges(state)
+
+    def _release(self, state: _UserState):
+        state.active -= 1
+        self._in_flight -= 1
+        self._dispatch()
+        self._update_gauges(state)
+        self._prune()
+
+    def _prune(self):
+        """Kuyruğu boş, token kovası dolu kullanıcıların durumunu siler (yeni durumla eşdeğerdir)"""
+        now = time.monotonic()
+        if now - self._pruned_at < _PRUNE_INTERVAL:
+            return
+        self._pruned_at = now
+        for user_id, state in list(self._users.items()):
+            state.refill(now)
+            if state.idle:
+                del self._users[user_id]
+
+    def get_user_status(self, user) -> dict:
+        """Kullanıcının geçerli kotalarını ve anlık kullanımını döner"""
+        state = self._users.get(user.id)
+        if state is None:
+            state = _UserState(user.id)
+            state.configure(user)
+        else:
+            state.refill(time.monotonic())
+        return state.get_status()
+
+    def get_stats(self) -> dict:
+        """Genel ve kullanıcı başına kuyruk derinliği ve kısıtlama sayaçlarını döner"""
+        return {
+            "enabled": self.enabled,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._in_flight,
+            "queued": sum(len(state.waiters) for state in list(self._users.values())),
+            "max_queued_per_user": self.max_queued_per_user,
+            "users": {user_id: state.get_status() for user_id, state in list(self._users.items())},
+        }
@@ -0,0 +1,227 @@
+import os
+import time
+from typing import List, Tuple
+import numpy as np
+from app.core.config import settings
+
+EMPTY_BOXES = np.empty((0, 5), dtype=np.float32)
+
+class InferenceBackend:
+    """
+    Model çalıştırma arka uçları için ortak arayüz
+
+    `predict` her görüntü için (N, 5) boyutlu [x1, y1, x2, y2, confidence] dizisi
+    döner; koordinatlar orijinal görüntü uzayındadır.
+    """
+
+    name = "base"
+
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+        self.warmup_seconds = 0.0
+
+    def predict(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        raise NotImplementedError
+
+    def warmup(self, runs: int, imgsz: int = None):
+        """Tembel başlatma maliyetini ilk gerçek istekten önce öder"""
+        if runs <= 0:
+            return
+        imgsz = imgsz or settings.MODEL_IMGSZ
+        dummy = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+        started_at = time.perf_counter()
+        for _ in range(runs):
+            self.predict([dummy])
+        self.warmup_seconds = time.perf_counter() - started_at
+
+class UltralyticsBackend(InferenceBackend):
+    """ultralytics/PyTorch ile doğrudan `.pt` modeli çalıştırır"""
+
+    name = "ultralytics"
+
+    def __init__(self, model_path: str):
+        super().__init__(model_path)
+        if settings.INFERENCE_THREADS > 0:
+            import torch
+            torch.set_num_threads(settings.INFERENCE_THREADS)
+        from ultralytics import YOLO
+        self.model = YOLO(model_path)
+
+    def predict(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        results = self.model.predict(list(images), verbose=False)
+        return [self._result_to_array(result) for result in results]
+
+    @staticmethod
+    def _result_to_array(result) -> np.ndarray:
+        if result is None or result.boxes is None or len(result.boxes) == 0:
+            return EMPTY_BOXES
+        # boxes.data: [x1, y1, x2, y2, conf, cls]; tek bir cihaz -> host kopyası
+        return result.boxes.data.cpu().numpy()[:, :5]
+
+class _ExportedYoloBackend(InferenceBackend):
+    """
+    ONNX'e dışa aktarılmış YOLOv8 modelleri için NumPy tabanlı ön/son işleme
+
+    Letterbox, çıktı çözümleme ve NMS ultralytics varsayılanlarıyla aynıdır
+    (conf=0.25, iou=0.7), böylece arka uçlar aynı sonuçları üretir.
+    """
+
+    def __init__(self, model_path: str):
+        super().__init__(model_path)
+        self.onnx_path = export_onnx(model_path)
+        self.imgsz = settings.MODEL_IMGSZ
+        self.dynamic_batch = True
+        self.min_confidence = settings.MODEL_MIN_CONFIDENCE
+        self.nms_iou = settings.MODEL_NMS_IOU
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _letterbox(self, image: np.ndarray) -> Tuple[np.ndarray, float, float, float]:
+        import cv2
+        height, width = image.shape[:2]
+        ratio = min(self.imgsz / height, self.imgsz / width)
+        new_w, new_h = int(round(width * ratio)), int(round(height * ratio))
+        pad_x, pad_y = (self.imgsz - new_w) / 2, (self.imgsz - new_h) / 2
+        resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR) if (new_w, new_h) != (width, height) else image
+        canvas = np.full((self.imgsz, self.imgsz, 3), 114, dtype=np.uint8)
+        top, left = int(round(pad_y - 0.1)), int(round(pad_x - 0.1))
+        canvas[top:top + new_h, left:left + new_w] = resized
+        return canvas, ratio, left, top
+
+    def predict(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        if not images:
+            return []
+        letterboxed = [self._letterbox(image) for image in images]
+        # BGR HWC uint8 -> RGB CHW float32 [0, 1]
+        batch = np.stack([canvas for canvas, _, _, _ in letterboxed])
+        batch = np.ascontiguousarray(batch[..., ::-1].transpose(0, 3, 1, 2), dtype=np.float32) / 255.0
+
+        if self.dynamic_batch:
+            outputs = self._run(batch)
+        else:
+            outputs = np.concatenate([self._run(batch[i:i + 1]) for i in range(len(batch))])
+
+        return [
+            self._postprocess(output, ratio, left, top, image.shape[:2])
+            for output, (_, ratio, left, top), image in zip(outputs, letterboxed, images)
+        ]
+
+    def _postprocess(self, output: np.ndarray, ratio: float, left: float, top: float, shape) -> np.ndarray:
+        import cv2
+        # output: (4 + sınıf sayısı, aday sayısı) -> (aday sayısı, 4 + sınıf sayısı)
+        predictions = output.T
+        scores = predictions[:, 4:].max(axis=1)
+        keep = scores > self.min_confidence
+        if not keep.any():
+            return EMPTY_BOXES
+        predictions, scores = predictions[keep], scores[keep]
+
+        cx, cy, w, h = predictions[:, 0], predictions[:, 1], predictions[:, 2], predictions[:, 3]
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+
+        indices = cv2.dnn.NMSBoxes(
+            np.stack([boxes[:, 0], boxes[:, 1], w, h], axis=1).tolist(),
+            scores.tolist(), self.min_confidence, self.nms_iou
+        )
+        if len(indices) == 0:
+            return EMPTY_BOXES
+        indices = np.asarray(indices).reshape(-1)
+        boxes, scores = boxes[indices], scores[indices]
+
+        # Letterbox dolgusunu geri al ve orijinal koordinatlara ölçekle
+        boxes -= np.array([left, top, left, top], dtype=boxes.dtype)
+        boxes /= ratio
+        height, width = shape
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, width)
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, height)
+        return np.concatenate([boxes, scores[:, None]], axis=1).astype(np.float32)
+
+class OnnxRuntimeBackend(_ExportedYoloBackend):
+    """Modeli ONNX'e aktarıp ONNX Runtime (CPU) ile çalıştırır"""
+
+    name = "onnx"
+
+    def __init__(self, model_path: str):
+        super().__init__(model_path)
+        import onnxruntime as ort
+        options = ort.SessionOptions()
+        if settings.INFERENCE_THREADS > 0:
+            options.intra_op_num_threads = settings.INFERENCE_THREADS
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(self.onnx_path, options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.dynamic_batch = not isinstance(model_input.shape[0], int)
+        if isinstance(model_input.shape[2], int):
+            self.imgsz = model_input.shape[2]
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: batch})[0]
+
+class OpenVinoBackend(_ExportedYoloBackend):
+    """ONNX modelini OpenVINO ile derleyip CPU üzerinde çalıştırır"""
+
+    name = "openvino"
+
+    def __init__(self, model_path: str):
+        super().__init__(model_path)
+        from openvino.runtime import Core
+        core = Core()
+        config = {"PERFORMANCE_HINT": "LATENCY"}
+        if settings.INFERENCE_THREADS > 0:
+            config["INFERENCE_NUM_THREADS"] = str(settings.INFERENCE_THREADS)
+        model = core.read_model(self.onnx_path)
+        model_input = model.inputs[0].get_partial_shape()
+        self.dynamic_batch = model_input[0].is_dynamic
+        if model_input[2].is_static:
+            self.imgsz = model_input[2].get_length()
+        self.compiled_model = core.compile_model(model, "CPU", config)
+        self.output = self.compiled_model.output(0)
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        return self.compiled_model(batch)[self.output]
+
+BACKENDS = {
+    UltralyticsBackend.name: UltralyticsBackend,
+    OnnxRuntimeBackend.name: OnnxRuntimeBackend,
+    OpenVinoBackend.name: OpenVinoBackend,
+}
+
+def export_onnx(model_path: str) -> str:
+    """
+    `.pt` modelini (gerekirse) ONNX'e aktarır ve ONNX dosyasının yolunu döner
+
+    Aktarılmış dosya `.pt` dosyasından yeniyse tekrar aktarılmaz.
+    """
+    base, extension = os.path.splitext(model_path)
+    if extension == ".onnx":
+        return model_path
+    onnx_path = f"{base}.onnx"
+    if os.path.exists(onnx_path) and os.path.getmtime(onnx_path) >= os.path.getmtime(model_path):
+        return onnx_path
+
+    from ultralytics import YOLO
+    print(f"Model ONNX formatına aktarılıyor: {model_path}")
+    exported = YOLO(model_path).export(format="onnx", imgsz=settings.MODEL_IMGSZ, dynamic=True)
+    return str(exported)
+
+def create_backend(name: str, model_path: str) -> InferenceBackend:
+    """
+    İsmi verilen arka ucu oluşturur
+
+    İlgili çalışma zamanı kurulu değilse sırasıyla ONNX Runtime ve ultralytics
+    arka ucuna düşülür.
+    """
+    fallbacks = {"openvino": "onnx", "onnx": "ultralytics"}
+    while True:
+        backend_class = BACKENDS.get(name)
+        if backend_class is None:
+            raise ValueError(f"Bilinmeyen model arka ucu: {name}")
+        try:
+            return backend_class(model_path)
+        except ImportError as e:
+            if name not in fallbacks:
+                raise
+            print(f"{name} arka ucu kullanılamıyor ({e}), {fallbacks[name]} deneniyor")
+            name = fallbacks[name]
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
+from app.core.config import settings
+
+def service_unavailable(retry_after: int) -> HTTPException:
+    """Kuyruk dolu olduğunda dönülecek 503 hatasını oluşturur"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Sunucu şu anda yoğun, lütfen daha sonra tekrar deneyin",
+        headers={"Retry-After": str(retry_after)},
+    )
+
+class InferenceExecutor:
+    """
+    Model çıkarımını (ve benzeri CPU yoğun işleri) event loop dışında, sınırlı bir
+    iş parçacığı havuzunda çalıştırır
+    """
+
+    def __init__(self, max_workers: int = None, max_queue_size: int = None, retry_after: int = None,
+                 thread_name_prefix: str = "inference"):
+        self.max_workers = max_workers or settings.INFERENCE_WORKERS
+        self.max_queue_size = max_queue_size if max_queue_size is not None else settings.INFERENCE_QUEUE_SIZE
+        self.retry_after = retry_after or settings.INFERENCE_RETRY_AFTER
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=thread_name_prefix
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._rejected = 0
+
+    def _acquire_slot(self):
+        """Kuyrukta yer varsa ayırır, yoksa 503 döner"""
+        with self._lock:
+            # Çalışan işler + bekleyen işler kapasiteyi aşmamalı
+            if self._pending >= self.max_workers + self.max_queue_size:
+                self._rejected += 1
+                raise service_unavailable(self.retry_after)
+            self._pending += 1
+
+    def _release_slot(self):
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Bloklayan bir fonksiyonu havuzda çalıştırır ve sonucunu bekler
+
+        Args:
+            func: Çalıştırılacak fonksiyon
+            *args, **kwargs: Fonksiyon parametreleri
+
+        Returns:
+            Fonksiyonun dönüş değeri
+        """
+        self._acquire_slot()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+        finally:
+            self._release_slot()
+
+    def get_status(self):
+        """Havuz durumunu döner"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "pending": self._pending,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Havuzu kapatır"""
+        self._executor.shutdown(wait=wait)
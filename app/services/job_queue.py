@@ -0,0 +1,392 @@
+import asyncio
+import ipaddress
+import json
+import os
+import shutil
+import socket
+import time
+import urllib.parse
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update, func, or_, and_
+from app.core.config import settings
+from app.database.database import SessionLocal
+from app.models.job import Job
+
+# İşlemci: (iş, girdi baytları) -> (sonuç sözlüğü, (görüntü baytları, media type) ya da None)
+JobProcessor = Callable[[Job, bytes], Awaitable[Tuple[dict, Optional[Tuple[bytes, str]]]]]
+
+class JobQueue:
+    """
+    Veritabanı tabanlı, harici broker gerektirmeyen asenkron iş kuyruğu
+
+    Girdi dosyaları iş son durumuna (succeeded/failed) ulaşınca silinir, sonuç
+    görüntüleri `JOB_RESULT_TTL_SECONDS` sonra temizlenir.
+
+    İşler `jobs` tablosunda tutulur; çalışan işin sahibi olan işçi `heartbeat_at`
+    alanını düzenli olarak yeniler ve yalnızca kirası (`JOB_LEASE_SECONDS`) dolmuş
+    işler kuyruğa geri alınır. Böylece birden fazla süreç çalışırken başlayan bir
+    süreç, kardeşlerinin hâlâ çalıştırdığı işleri ikinci kez çalıştırmaz. İşçiler önceliğe göre iş seçer, kullanıcı başına eşzamanlı
+    iş sınırına uyar, hata durumunda üstel bekleme ile tekrar dener ve iş bittiğinde
+    varsa callback URL'ine sonucu POST eder.
+    """
+
+    def __init__(self, processor: JobProcessor, is_ready: Callable[[], bool] = lambda: True,
+                 workers: int = None, poll_interval: float = None, per_user_limit: int = None):
+        self.processor = processor
+        self.is_ready = is_ready
+        self.workers = workers or settings.JOB_WORKERS
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL
+        self.per_user_limit = per_user_limit or settings.JOB_PER_USER_CONCURRENCY
+        self.storage_dir = settings.JOB_STORAGE_DIR
+        self.lease_seconds = settings.JOB_LEASE_SECONDS
+        self._tasks = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._claim_lock: Optional[asyncio.Lock] = None
+        self._callback_tasks = set()
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+
+    def job_dir(self, job_id: str) -> str:
+        return os.path.join(self.storage_dir, job_id)
+
+    def save_input(self, job_id: str, contents: bytes) -> str:
+        """İş girdisini diske yazar ve yolunu döner"""
+        directory = self.job_dir(job_id)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, "input")
+        with open(path, "wb") as f:
+            f.write(contents)
+        return path
+
+    def notify(self):
+        """Yeni iş eklendiğinde bekleyen işçileri uyandırır"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self):
+        """Kirası dolmuş işleri kuyruğa geri alır ve işçileri başlatır"""
+        if self._tasks or self.workers <= 0:
+            return
+        os.makedirs(self.storage_dir, exist_ok=True)
+        await self._requeue_expired()
+        self._wakeup = asyncio.Event()
+        self._claim_lock = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        # Çöken süreçlerin işleri yeniden başlatma beklenmeden geri alınır
+        self._tasks.append(loop.create_task(self._reap_expired()))
+        self._tasks.append(loop.create_task(self._cleanup_storage()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def _requeue_expired(self):
+        """Son kira yenilemesi `lease_seconds` süresinden eski olan çalışan işleri kuyruğa geri alır"""
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=self.lease_seconds)
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(Job)
+                .where(
+                    Job.status == "running",
+                    or_(
+                        Job.heartbeat_at < cutoff,
+                        and_(Job.heartbeat_at.is_(None), Job.started_at < cutoff),
+                    ),
+                )
+                .values(status="queued", available_at=now)
+            )
+            await db.commit()
+        if result.rowcount:
+            print(f"Kirası dolan {result.rowcount} iş kuyruğa geri alındı")
+            self.notify()
+
+    async def _reap_expired(self):
+        while True:
+            await asyncio.sleep(self.lease_seconds)
+            try:
+                await self._requeue_expired()
+            except Exception as e:
+                print(f"Kirası dolan işler geri alınamadı: {e}")
+
+    async def _cleanup_storage(self):
+        while True:
+            try:
+                removed = await self.expire_results()
+                if removed:
+                    print(f"Süresi dolan {removed} iş dosyası silindi")
+            except Exception as e:
+                print(f"İş dosyaları temizlenemedi: {e}")
+            await asyncio.sleep(settings.JOB_CLEANUP_INTERVAL)
+
+    async def expire_results(self, ttl_seconds: float = None) -> int:
+        """
+        `ttl_seconds` süresinden eski iş dizinlerini siler
+
+        Kuyrukta ya da çalışmakta olan işlerin dizinlerine dokunulmaz; silinen
+        işlerin (ör. kullanıcısı silinmiş) artık dizinleri de temizlenir.
+
+        Returns:
+            int: Silinen dizin sayısı
+        """
+        ttl_seconds = settings.JOB_RESULT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        cutoff = time.time() - ttl_seconds
+        expired = await run_in_threadpool(_old_entries, self.storage_dir, cutoff)
+        if not expired:
+            return 0
+        async with SessionLocal() as db:
+            active = await db.execute(
+                select(Job.id).where(Job.id.in_(expired), Job.status.in_(("queued", "running")))
+            )
+            active_ids = set(active.scalars().all())
+            expired = [job_id for job_id in expired if job_id not in active_ids]
+            if not expired:
+                return 0
+            await db.execute(update(Job).where(Job.id.in_(expired)).values(result_image_path=None))
+            await db.commit()
+        for job_id in expired:
+            await run_in_threadpool(shutil.rmtree, self.job_dir(job_id), True)
+        return len(expired)
+
+    async def _renew_lease(self, job_id: str):
+        """İş sürdükçe kirayı yeniler; iş artık bu işçide değilse durur"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with SessionLocal() as db:
+                    renewed = await db.execute(
+                        update(Job)
+                        .where(Job.id == job_id, Job.status == "running")
+                        .values(heartbeat_at=datetime.now(timezone.utc))
+                    )
+                    await db.commit()
+                if renewed.rowcount == 0:
+                    return
+            except Exception as e:
+                print(f"İş kirası yenilenemedi ({job_id}): {e}")
+
+    async def _worker(self):
+        while True:
+            job = None
+            if self.is_ready():
+                try:
+                    job = await self._claim_next()
+                except Exception as e:
+                    print(f"Kuyruktan iş alınamadı: {e}")
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            try:
+                await self._execute(job)
+            except Exception as e:
+                # İşçi görevi sonlanmaz; iş kirası dolunca başka bir işçi tarafından geri alınır
+                print(f"İş tamamlanamadı ({job.id}): {e}")
+
+    async def _claim_next(self) -> Optional[Job]:
+        """
+        Öncelik sırasına göre sıradaki uygun işi 'running' olarak işaretler
+
+        Sahiplenme koşullu UPDATE ile yapılır; aynı işi iki işçi (ya da iki süreç)
+        alamaz. Eşzamanlı iş sınırını dolduran kullanıcıların işleri atlanır.
+        """
+        async with self._claim_lock:
+            async with SessionLocal() as db:
+                now = datetime.now(timezone.utc)
+                running = await db.execute(
+                    select(Job.user_id, func.count())
+                    .where(Job.status == "running")
+                    .group_by(Job.user_id)
+                )
+                saturated = {user_id for user_id, count in running.all() if count >= self.per_user_limit}
+
+                query = (
+                    select(Job)
+                    .where(Job.status == "queued", Job.available_at <= now)
+                    .order_by(Job.priority.desc(), Job.available_at, Job.created_at)
+                    .limit(self.workers * 4 + len(saturated))
+                )
+                if saturated:
+                    query = query.where(Job.user_id.notin_(saturated))
+                candidates = (await db.execute(query)).scalars().all()
+
+                for job in candidates:
+                    claimed = await db.execute(
+                        update(Job)
+                        .where(Job.id == job.id, Job.status == "queued")
+                        .values(status="running", started_at=now, heartbeat_at=now, attempts=Job.attempts + 1)
+                    )
+                    await db.commit()
+                    if claimed.rowcount == 1:
+                        await db.refresh(job)
+                        return job
+        return None
+
+    async def _execute(self, job: Job):
+        lease = asyncio.get_running_loop().create_task(self._renew_lease(job.id))
+        try:
+            contents = await run_in_threadpool(_read_file, job.input_path)
+            result, image = await self.processor(job, contents)
+        except Exception as e:
+            await self._handle_failure(job, e)
+            return
+        finally:
+            lease.cancel()
+
+        values = {
+            "status": "succeeded",
+            "finished_at": datetime.now(timezone.utc),
+            "result_json": json.dumps(result, ensure_ascii=False),
+            "error": None,
+        }
+        if image is not None:
+            content, media_type = image
+            path = os.path.join(self.job_dir(job.id), "result")
+            await run_in_threadpool(_write_file, path, content)
+            values.update(result_image_path=path, result_media_type=media_type)
+        await self._update(job.id, **values)
+        await run_in_threadpool(_remove_file, job.input_path)
+        self.processed += 1
+        self._schedule_callback(job, "succeeded", result)
+
+    async def _handle_failure(self, job: Job, error: Exception):
+        detail = getattr(error, "detail", None) or str(error)
+        if job.attempts < job.max_attempts and not _is_permanent(error):
+            # Üstel bekleme ile tekrar dene
+            delay = settings.JOB_RETRY_BACKOFF * (2 ** (job.attempts - 1))
+            await self._update(
+                job.id,
+                status="queued",
+                error=str(detail),
+                available_at=datetime.now(timezone.utc) + timedelta(seconds=delay),
+            )
+            self.retried += 1
+            return
+        await self._update(job.id, status="failed", error=str(detail), finished_at=datetime.now(timezone.utc))
+        await run_in_threadpool(_remove_file, job.input_path)
+        self.failed += 1
+        self._schedule_callback(job, "failed", {"error": str(detail)})
+
+    async def _update(self, job_id: str, **values):
+        async with SessionLocal() as db:
+            await db.execute(update(Job).where(Job.id == job_id).values(**values))
+            await db.commit()
+
+    def _schedule_callback(self, job: Job, status: str, payload: dict):
+        """Callback'i işçiyi bekletmeden arka planda gönderir"""
+        if not job.callback_url:
+            return
+        task = asyncio.get_running_loop().create_task(self._send_callback(job, status, payload))
+        self._callback_tasks.add(task)
+        task.add_done_callback(self._callback_tasks.discard)
+
+    async def _send_callback(self, job: Job, status: str, payload: dict):
+        body = json.dumps({"job_id": job.id, "status": status, "result": payload}, ensure_ascii=False).encode("utf-8")
+        callback_status = "failed"
+        for attempt in range(settings.JOB_CALLBACK_RETRIES):
+            try:
+                # Adres kayıttan sonra iç ağa çözülecek şekilde değiştirilmiş olabilir, gönderimde tekrar kontrol edilir
+                await run_in_threadpool(check_callback_url, job.callback_url)
+                await run_in_threadpool(_post_json, job.callback_url, body)
+                callback_status = "delivered"
+                break
+            except Exception as e:
+                print(f"Callback gönderilemedi ({job.callback_url}): {e}")
+                await asyncio.sleep(settings.JOB_RETRY_BACKOFF * (2 ** attempt))
+        await self._update(job.id, callback_status=callback_status)
+
+    def get_stats(self):
+        return {
+            "workers": len(self._tasks),
+            "per_user_limit": self.per_user_limit,
+            "processed": self.processed,
+            "failed": self.failed,
+            "retried": self.retried,
+        }
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+def _is_permanent(error: Exception) -> bool:
+    """Tekrar denemekle düzelmeyecek istemci hataları (ör. çözülemeyen görüntü); 408 ve 429 geçicidir"""
+    status_code = getattr(error, "status_code", None)
+    return isinstance(status_code, int) and 400 <= status_code < 500 and status_code not in (408, 429)
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _old_entries(directory: str, cutoff: float) -> list:
+    """Değişme zamanı `cutoff` öncesinde kalan alt dizinlerin adları"""
+    try:
+        with os.scandir(directory) as entries:
+            return [entry.name for entry in entries if entry.is_dir() and entry.stat().st_mtime < cutoff]
+    except OSError:
+        return []
+
+def _write_file(path: str, content: bytes):
+    with open(path, "wb") as f:
+        f.write(content)
+
+def _host_allowed(host: str) -> bool:
+    return any(host == allowed or host.endswith("." + allowed) for allowed in settings.JOB_CALLBACK_ALLOWED_HOSTS)
+
+def check_callback_url(url: str):
+    """
+    Callback adresinin sunucudan iç ağa istek attırmak (SSRF) için kullanılamayacağını doğrular
+
+    Host çözülür; adreslerden biri loopback, link-local (ör. 169.254.169.254), özel,
+    multicast ya da ayrılmış aralıktaysa reddedilir. JOB_CALLBACK_ALLOWED_HOSTS
+    listesindeki host'lar bu kontrolden muaftır.
+
+    Raises:
+        ValueError: Adres geçersizse ya da izin verilmeyen bir ağa çözülüyorsa
+    """
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError("Callback adresi http:// veya https:// ile başlamalıdır")
+    host = parsed.hostname.lower().rstrip(".")
+    if _host_allowed(host):
+        return
+    try:
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)}
+    except (OSError, ValueError):
+        raise ValueError("Callback adresi çözümlenemedi")
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+        if ip.version == 6 and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError("Callback adresi iç ağa ya da ayrılmış bir adrese çözülüyor")
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Yönlendirmeler izlenmez; aksi halde doğrulanmış adres iç ağa yönlendirebilir"""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        raise ValueError(f"Callback yönlendirmesi izlenmez (HTTP {code})")
+
+_callback_opener = urllib.request.build_opener(_NoRedirect)
+
+def _post_json(url: str, body: bytes):
+    request = urllib.request.Request(url, data=body, method="POST", headers={"Content-Type": "application/json"})
+    with _callback_opener.open(request, timeout=settings.JOB_CALLBACK_TIMEOUT) as response:
+        if response.status >= 400:
+            raise ValueError(f"HTTP {response.status}")
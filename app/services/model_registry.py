@@ -0,0 +1,220 @@
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from app.core.config import settings
+from app.services.inference_backends import InferenceBackend, create_backend
+from app.utils.metrics import Histogram, process_rss_bytes
+
+_LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+def compute_model_version(backend_name: str, model_path: str) -> str:
+    """Arka uç adı ile model dosyasının adı, boyutu ve değişme zamanından sürüm etiketi üretir"""
+    try:
+        stat = os.stat(model_path)
+        return f"{backend_name}:{os.path.basename(model_path)}:{stat.st_size}:{int(stat.st_mtime)}"
+    except OSError:
+        return f"{backend_name}:{model_path}"
+
+class ModelEntry:
+    """Kayıttaki tek bir model sürümü ve kullanım istatistikleri"""
+
+    def __init__(self, name: str, backend: InferenceBackend, model_path: str, version: str,
+                 load_seconds: float = 0.0, memory_bytes: int = 0):
+        self.name = name
+        self.backend = backend
+        self.model_path = model_path
+        self.version = version
+        self.loaded_at = time.time()
+        self.load_seconds = load_seconds
+        self.memory_bytes = memory_bytes
+        self.last_used = time.monotonic()
+        self.images = 0
+        self.latency = Histogram(
+            "plaka_model_predict_latency_ms",
+            buckets=_LATENCY_BUCKETS_MS,
+            description="Model başına toplu tahmin süresi (ms)",
+        )
+
+    def predict(self, images: List) -> List:
+        """Tahmini çalıştırır, gecikme ve son kullanım zamanını kaydeder"""
+        started_at = time.perf_counter()
+        results = self.backend.predict(images)
+        self.latency.observe((time.perf_counter() - started_at) * 1000.0)
+        self.images += len(images)
+        self.last_used = time.monotonic()
+        return results
+
+    def get_status(self) -> dict:
+        latency = self.latency.snapshot()
+        return {
+            "name": self.name,
+            "version": self.version,
+            "backend": self.backend.name,
+            "model_path": self.model_path,
+            "loaded_at": self.loaded_at,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.backend.warmup_seconds,
+            "memory_bytes": self.memory_bytes,
+            "idle_seconds": round(time.monotonic() - self.last_used, 1),
+            "images": self.images,
+            "latency_ms_mean": latency["sum"] / latency["count"] if latency["count"] else None,
+            "latency_ms": latency,
+        }
+
+class ModelRegistry:
+    """
+    İsimli, sürümlü modelleri tutar ve istekleri aktif ya da aday modele yönlendirir
+
+    Yeni sürüm kilit dışında yüklenip ısındırılır, ardından sözlükteki kayıt tek bir
+    atama ile değiştirilir; o sırada eski sürümü kullanan istekler kendi referanslarıyla
+    tamamlanır. Aktif ve aday olmayan modeller boşta kaldıklarında bellekten çıkarılır.
+    """
+
+    def __init__(self, max_loaded: int = None):
+        self.max_loaded = max_loaded or settings.MODEL_MAX_LOADED
+        self._entries: Dict[str, ModelEntry] = {}
+        self._lock = threading.Lock()
+        # Yüklemeler sırayla yapılır; bellek ölçümü (RSS farkı) birbirine karışmaz
+        self._load_lock = threading.Lock()
+        self.loading: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+        self.active: Optional[str] = None
+        self.candidate: Optional[str] = None
+        self.candidate_share = 0.0
+
+    def load(self, name: str, model_path: str, backend: str = None, activate: bool = False,
+             warmup_runs: int = None, on_stage: Callable[[str, float], None] = None) -> ModelEntry:
+        """
+        Modeli yükler, ısındırır ve kayda ekler (bloklar; arka plan iş parçacığında çağrılmalıdır)
+
+        Aynı isimde bir model varsa ısınma bittikten sonra yeni sürümle değiştirilir.
+        `on_stage(aşama, ilerleme)` verilirse yükleme aşamaları bildirilir.
+        """
+        on_stage = on_stage or (lambda stage, progress: None)
+        backend = backend or settings.MODEL_BACKEND
+        warmup_runs = settings.MODEL_WARMUP_RUNS if warmup_runs is None else warmup_runs
+        with self._load_lock:
+            self.loading[name] = model_path
+            self.errors.pop(name, None)
+            try:
+                self._make_room(name)
+                rss_before = process_rss_bytes()
+                started_at = time.perf_counter()
+                on_stage("loading_backend", 0.1)
+                model = create_backend(backend, model_path)
+                # İlk gerçek isteğin tembel başlatma maliyetini ödememesi için ısınma çıkarımları
+                on_stage("warmup", 0.7)
+                model.warmup(warmup_runs)
+                entry = ModelEntry(
+                    name, model, model_path,
+                    version=compute_model_version(model.name, model_path),
+                    load_seconds=time.perf_counter() - started_at,
+                    memory_bytes=max(process_rss_bytes() - rss_before, 0),
+                )
+            except Exception as e:
+                self.errors[name] = str(e)
+                raise
+            finally:
+                self.loading.pop(name, None)
+
+        self.add(entry, activate=activate)
+        return entry
+
+    def add(self, entry: ModelEntry, activate: bool = False):
+        """Hazır bir modeli kayda ekler; `activate` ise ya da aktif model yoksa aktif yapar"""
+        with self._lock:
+            self._entries[entry.name] = entry
+            if activate or self.active is None:
+                self.active = entry.name
+                if self.candidate == entry.name:
+                    self.candidate, self.candidate_share = None, 0.0
+
+    def _make_room(self, incoming: str):
+        """Kayıt doluysa en uzun süredir kullanılmayan, aktif/aday olmayan modeli çıkarır"""
+        with self._lock:
+            if incoming in self._entries or len(self._entries) < self.max_loaded:
+                return
+            evictable = [entry for entry in self._entries.values() if entry.name not in (self.active, self.candidate)]
+            if not evictable:
+                raise ValueError(f"En fazla {self.max_loaded} model yüklenebilir; çıkarılabilecek model yok")
+            oldest = min(evictable, key=lambda entry: entry.last_used)
+            del self._entries[oldest.name]
+            print(f"Model bellekten çıkarıldı: {oldest.name} ({oldest.version})")
+
+    def get(self, name: Optional[str] = None) -> Optional[ModelEntry]:
+        """İsmi verilen modeli, isim yoksa (ya da model çıkarılmışsa) aktif modeli döner"""
+        entries = self._entries
+        entry = entries.get(name) if name is not None else None
+        if entry is None and self.active is not None:
+            entry = entries.get(self.active)
+        return entry
+
+    def route(self) -> Optional[ModelEntry]:
+        """İsteğin çalışacağı modeli seçer; aday varsa trafiğin `candidate_share` kadarı ona gider"""
+        candidate = self.candidate
+        if candidate is not None and self.candidate_share > 0 and random.random() < self.candidate_share:
+            entry = self._entries.get(candidate)
+            if entry is not None:
+                return entry
+        return self.get()
+
+    def activate(self, name: str):
+        """Modeli aktif yapar (atomik geçiş)"""
+        with self._lock:
+            if name not in self._entries:
+                raise KeyError(name)
+            self.active = name
+            if self.candidate == name:
+                self.candidate, self.candidate_share = None, 0.0
+
+    def set_candidate(self, name: Optional[str], share: float):
+        """A/B testi için aday modeli ve alacağı trafik oranını (0-1) ayarlar; name None ise kapatır"""
+        with self._lock:
+            if name is not None and name not in self._entries:
+                raise KeyError(name)
+            if name is not None and name == self.active:
+                raise ValueError("Aktif model aday olarak seçilemez")
+            self.candidate = name
+            self.candidate_share = min(max(share, 0.0), 1.0) if name is not None else 0.0
+
+    def unload(self, name: str):
+        """Aktif olmayan bir modeli bellekten çıkarır"""
+        with self._lock:
+            if name == self.active:
+                raise ValueError("Aktif model kaldırılamaz")
+            if self._entries.pop(name, None) is None:
+                raise KeyError(name)
+            if self.candidate == name:
+                self.candidate, self.candidate_share = None, 0.0
+
+    def evict_idle(self, idle_seconds: float) -> List[str]:
+        """`idle_seconds` süredir kullanılmayan, aktif ve aday olmayan modelleri çıkarır"""
+        if idle_seconds <= 0:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                name for name, entry in self._entries.items()
+                if name not in (self.active, self.candidate) and now - entry.last_used > idle_seconds
+            ]
+            for name in idle:
+                del self._entries[name]
+        return idle
+
+    @property
+    def total_memory_bytes(self) -> int:
+        return sum(entry.memory_bytes for entry in list(self._entries.values()))
+
+    def get_status(self) -> dict:
+        entries = list(self._entries.values())
+        return {
+            "active": self.active,
+            "candidate": self.candidate,
+            "candidate_share": self.candidate_share,
+            "max_loaded": self.max_loaded,
+            "loading": dict(self.loading),
+            "errors": dict(self.errors),
+            "models": [entry.get_status() for entry in entries],
+        }
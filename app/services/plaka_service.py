@@ -1,78 +1,282 @@
-import cv2
+import asyncio
+import os
+import threading
+import time
 import numpy as np
-from ultralytics import YOLO
+from typing import List, Optional
 from fastapi import HTTPException, status
-from app.schemas.plaka import PlakaDetection
 from app.core.config import settings
+from app.services.model_registry import ModelEntry, ModelRegistry
+from app.services.tiling import TileOptions, merge_tile_boxes, plan_tiles, slice_image
+from app.utils.tracing import stage
+
+# Açılışta MODEL_PATH'ten yüklenen modelin kayıttaki adı
+DEFAULT_MODEL = "default"
 
 class PlakaService:
     def __init__(self):
-        self.model = None
+        self.registry = ModelRegistry()
+        self.ocr = None
+        # Yükleme durumu: not_loaded, loading, ready, failed
+        self.state = "not_loaded"
+        self.stage = None
+        self.progress = 0.0
+        self.load_started_at = None
+        self.load_seconds = None
+        self.load_error = None
+        self._load_lock = threading.Lock()
+        self._watched_mtime = None
+    
+    @property
+    def model(self):
+        """Aktif modelin arka ucu (yüklenmediyse None)"""
+        entry = self.registry.get()
+        return entry.backend if entry is not None else None
+    
+    @property
+    def model_version(self) -> str:
+        entry = self.registry.get()
+        return entry.version if entry is not None else "unloaded"
+    
+    @property
+    def model_memory_bytes(self) -> Optional[int]:
+        """Yüklü tüm modellerin yüklenirken artırdığı süreç belleği"""
+        return self.registry.total_memory_bytes or None
+    
+    def load(self):
+        """
+        Modeli yükler; uygulama açılışında arka planda bir kez çağrılır
+        
+        Ağır kütüphaneler (ultralytics, torch, onnxruntime) yalnızca burada import edilir.
+        """
+        with self._load_lock:
+            if self.state in ("loading", "ready"):
+                return
+            self.state = "loading"
+            self.load_error = None
+            self.load_started_at = time.time()
+        started_at = time.perf_counter()
         self._load_model()
+        self.load_seconds = time.perf_counter() - started_at
+        self.state = "ready" if self.model is not None else "failed"
+    
+    def _set_stage(self, stage: str, progress: float):
+        self.stage = stage
+        self.progress = progress
     
     def _load_model(self):
-        """YOLO modelini yükle"""
+        """YOLO modelini ayarlarda seçilen arka uçla yükle ve ısındır"""
         try:
-            self.model = YOLO(settings.MODEL_PATH)
-            print(f"Model başarıyla yüklendi: {settings.MODEL_PATH}")
+            entry = self.registry.load(
+                DEFAULT_MODEL, settings.MODEL_PATH, settings.MODEL_BACKEND,
+                activate=True, on_stage=self._set_stage
+            )
+            self._watched_mtime = _file_mtime(settings.MODEL_PATH)
+            print(f"Model başarıyla yüklendi: {settings.MODEL_PATH} ({entry.backend.name})")
+            if settings.MODEL_WARMUP_RUNS > 0:
+                print(f"Model ısındırıldı: {entry.backend.warmup_seconds:.2f} sn")
+            self._set_stage("ready", 1.0)
         except Exception as e:
             print(f"Model yüklenirken hata oluştu: {e}")
-            self.model = None
+            self.load_error = str(e)
+            self._set_stage("failed", self.progress)
+            return
+        
+        if settings.OCR_ENABLED:
+            self._load_ocr()
+    
+    def load_model(self, name: str, model_path: str, backend: Optional[str] = None,
+                   activate: bool = False, candidate_share: Optional[float] = None) -> ModelEntry:
+        """
+        Çalışırken yeni bir model ya da mevcut modelin yeni sürümünü yükler (bloklar)
+        
+        Model ısındırılana kadar istekler eski sürümle karşılanmaya devam eder.
+        
+        Args:
+            name: Kayıttaki model adı
+            model_path: Ağırlık dosyası
+            backend: Arka uç (varsayılan: MODEL_BACKEND)
+            activate: True ise yükleme bitince tüm trafik bu modele geçer
+            candidate_share: Verilirse model A/B adayı olur ve trafiğin bu oranını alır
+        """
+        entry = self.registry.load(name, model_path, backend, activate=activate)
+        if candidate_share is not None and not activate:
+            self.registry.set_candidate(name, candidate_share)
+        if name == DEFAULT_MODEL and model_path == settings.MODEL_PATH:
+            self._watched_mtime = _file_mtime(model_path)
+        # Açılıştaki yükleme başarısız olduysa elle yüklenen model servisi hazır hale getirir
+        if self.state != "ready" and self.model is not None:
+            self.state = "ready"
+            self.load_error = None
+            self._set_stage("ready", 1.0)
+        return entry
+    
+    def maintain(self):
+        """
+        Boşta kalan modelleri bellekten çıkarır ve MODEL_PATH değiştiyse varsayılan modeli
+        arka planda yeniden yükleyip ısındıktan sonra yerine koyar
+        """
+        for name in self.registry.evict_idle(settings.MODEL_IDLE_EVICT_SECONDS):
+            print(f"Boştaki model bellekten çıkarıldı: {name}")
+        
+        if not settings.MODEL_RELOAD_ON_CHANGE or not self.is_ready:
+            return
+        mtime = _file_mtime(settings.MODEL_PATH)
+        if mtime is None or mtime == self._watched_mtime:
+            return
+        self._watched_mtime = mtime
+        print(f"Model dosyası değişti, yeniden yükleniyor: {settings.MODEL_PATH}")
+        try:
+            self.registry.load(
+                DEFAULT_MODEL, settings.MODEL_PATH, settings.MODEL_BACKEND,
+                activate=self.registry.active == DEFAULT_MODEL
+            )
+        except Exception as e:
+            print(f"Model yeniden yüklenemedi, eski sürüm kullanılmaya devam ediyor: {e}")
+    
+    async def run_maintenance(self, interval: float = None):
+        """`maintain` işini belirli aralıklarla arka plan iş parçacığında çalıştırır"""
+        interval = interval or settings.MODEL_MAINTENANCE_INTERVAL
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await loop.run_in_executor(None, self.maintain)
+            except Exception as e:
+                print(f"Model bakımı başarısız: {e}")
+    
+    def _load_ocr(self):
+        """OCR modelini yükler; yüklenemezse tespit OCR olmadan çalışmaya devam eder"""
+        try:
+            from app.services.plate_ocr import PlateOCR
+            self._set_stage("loading_ocr", 0.9)
+            self.ocr = PlateOCR()
+            self.ocr.warmup(settings.MODEL_WARMUP_RUNS)
+            print(f"OCR modeli yüklendi: {settings.OCR_MODEL_PATH}")
+        except Exception as e:
+            print(f"OCR modeli yüklenemedi: {e}")
+            self.ocr = None
+        self._set_stage("ready", 1.0)
+    
+    @property
+    def is_ready(self) -> bool:
+        return self.state == "ready"
+    
+    def ensure_ready(self):
+        """Model hazır değilse uygun HTTP hatasını fırlatır"""
+        if self.state == "ready":
+            return
+        if self.state in ("not_loaded", "loading"):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Model yükleniyor, lütfen daha sonra tekrar deneyin",
+                headers={"Retry-After": str(settings.INFERENCE_RETRY_AFTER)},
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Model yüklenemedi"
+        )
+    
+    def route(self) -> Optional[ModelEntry]:
+        """İsteğin çalışacağı modeli (aktif ya da A/B adayı) seçer"""
+        return self.registry.route()
     
-    def detect_plates(self, image_array: np.ndarray, confidence_threshold: float = 0.75):
+    def _get_entry(self, model: Optional[str]) -> ModelEntry:
+        self.ensure_ready()
+        entry = self.registry.get(model)
+        if entry is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Model yüklenemedi"
+            )
+        return entry
+    
+    def detect_plates(self, image_array: np.ndarray, confidence_threshold: float = 0.75, model: Optional[str] = None):
         """
         Görüntüde plaka tespiti yapar
         
         Args:
             image_array: OpenCV formatında görüntü
             confidence_threshold: Güven eşiği (varsayılan: 0.75)
+            model: Kayıttaki model adı (varsayılan: aktif model)
         
         Returns:
-            Tuple: (işaretlenmiş görüntü, tespit listesi)
+            np.ndarray: (N, 5) boyutlu [x1, y1, x2, y2, confidence] kutu dizisi
         """
-        if self.model is None:
+        entry = self._get_entry(model)
+        
+        try:
+            # YOLO ile tahmin yap
+            with stage("inference"):
+                boxes = entry.predict([image_array])[0]
+            with stage("postprocess"):
+                return self.filter_boxes(boxes, confidence_threshold)
+            
+        except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Model yüklenemedi"
+                detail=f"Plaka tespiti sırasında hata oluştu: {str(e)}"
             )
+    
+    def detect_plates_batch(self, image_arrays: List[np.ndarray], confidence_thresholds: List[float],
+                            model: Optional[str] = None):
+        """
+        Birden fazla görüntüde tek bir toplu tahmin ile plaka tespiti yapar
+        
+        Args:
+            image_arrays: OpenCV formatında görüntü listesi
+            confidence_thresholds: Her görüntü için güven eşiği
+            model: Kayıttaki model adı (varsayılan: aktif model)
+        
+        Returns:
+            List[np.ndarray]: Her görüntü için (N, 5) boyutlu kutu dizisi
+        """
+        entry = self._get_entry(model)
         
         try:
-            # YOLO ile tahmin yap
-            result = self.model.predict(image_array, verbose=False)
-            
-            detections = []
-            marked_image = image_array.copy()
-            
-            if len(result) > 0 and result[0].boxes is not None:
-                boxes = result[0].boxes
-                
-                for box in boxes:
-                    x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                    conf = box.conf[0].cpu().numpy()
-                    
-                    if conf > confidence_threshold:
-                        # Görüntüye dikdörtgen çiz
-                        cv2.rectangle(marked_image, 
-                                    (int(x1), int(y1)), 
-                                    (int(x2), int(y2)), 
-                                    (0, 0, 255), 2)
-                        
-                        # Etiket ekle
-                        label = f"Plaka - {conf:.2f}"
-                        cv2.putText(marked_image, label, 
-                                  (int(x1), int(y1) - 10), 
-                                  cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
-                        
-                        # Tespit bilgilerini kaydet
-                        detections.append(PlakaDetection(
-                            x1=float(x1),
-                            y1=float(y1),
-                            x2=float(x2),
-                            y2=float(y2),
-                            confidence=float(conf)
-                        ))
+            # Tüm görüntüler tek forward pass ile işlenir
+            with stage("inference"):
+                results = entry.predict(list(image_arrays))
+            with stage("postprocess"):
+                return [
+                    self.filter_boxes(boxes, threshold)
+                    for boxes, threshold in zip(results, confidence_thresholds)
+                ]
             
-            return marked_image, detections
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Plaka tespiti sırasında hata oluştu: {str(e)}"
+            )
+    
+    def detect_plates_tiled(self, image_array: np.ndarray, confidence_threshold: float,
+                            options: TileOptions, model: Optional[str] = None):
+        """
+        Yüksek çözünürlüklü görüntüyü örtüşen parçalara bölerek plaka tespiti yapar
+        
+        Tam kare model girdisine küçültüldüğünde birkaç on piksellik plakalar kaybolur;
+        parçalar tam çözünürlükte kalır. Parçalar ve (büyük plakalar için) tam kare tek
+        bir toplu tahminle çalıştırılır, kutular parçalar arası NMS ile birleştirilir.
+        
+        Args:
+            image_array: OpenCV formatında görüntü
+            confidence_threshold: Güven eşiği
+            options: Parça boyutu ve örtüşme ayarları
+            model: Kayıttaki model adı (varsayılan: aktif model)
+        
+        Returns:
+            np.ndarray: (N, 5) boyutlu, orijinal koordinatlarda kutu dizisi
+        """
+        entry = self._get_entry(model)
+        height, width = image_array.shape[:2]
+        tiles = plan_tiles(height, width, options.tile_size, options.overlap)
+        
+        try:
+            with stage("inference"):
+                results = entry.predict(slice_image(image_array, tiles) + [image_array])
+            with stage("postprocess"):
+                results = [self.filter_boxes(boxes, confidence_threshold) for boxes in results]
+                return merge_tile_boxes(results[:-1], tiles, settings.TILE_MERGE_THRESHOLD, extra=results[-1])
             
         except Exception as e:
             raise HTTPException(
@@ -80,10 +284,118 @@ class PlakaService:
                 detail=f"Plaka tespiti sırasında hata oluştu: {str(e)}"
             )
     
+    def read_plates(self, image_array: np.ndarray, boxes: np.ndarray) -> List[Optional[dict]]:
+        """
+        Tespit edilen plakaları aynı decode edilmiş görüntü üzerinden toplu olarak okur
+        
+        Args:
+            image_array: OpenCV formatında görüntü
+            boxes: (N, 5) boyutlu kutu dizisi
+        
+        Returns:
+            List: Her kutu için {"text", "char_confidences"} ya da None
+        """
+        if self.ocr is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Plaka okuma (OCR) etkin değil"
+            )
+        if len(boxes) == 0:
+            return []
+        
+        try:
+            with stage("ocr"):
+                return self.ocr.read(image_array, boxes)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Plaka okuma sırasında hata oluştu: {str(e)}"
+            )
+    
+    @staticmethod
+    def filter_boxes(boxes: np.ndarray, confidence_threshold: float) -> np.ndarray:
+        """Kutu dizisini güven eşiğine göre maskeler"""
+        return boxes[boxes[:, 4] > confidence_threshold]
+    
+    @staticmethod
+    def render_detections(image_array: np.ndarray, boxes: np.ndarray, in_place: bool = True,
+                          readings: Optional[List[Optional[dict]]] = None) -> np.ndarray:
+        """
+        Tespit edilen kutuları görüntü üzerine çizer
+        
+        Args:
+            image_array: OpenCV formatında görüntü
+            boxes: (N, 5) boyutlu kutu dizisi
+            in_place: True ise mümkün olduğunda doğrudan verilen tampona çizer
+            readings: `read_plates` sonucu; verilirse etikette plaka metni yazılır
+        
+        Returns:
+            np.ndarray: İşaretlenmiş görüntü
+        """
+        import cv2
+        
+        with stage("annotate"):
+            # Salt okunur ya da bitişik olmayan tamponlara çizilemez, bu durumda kopya alınır
+            writable = image_array.flags.writeable and image_array.flags.c_contiguous
+            marked_image = image_array if in_place and writable else image_array.copy()
+            
+            for index, (x1, y1, x2, y2, conf) in enumerate(boxes.tolist()):
+                # Görüntüye dikdörtgen çiz
+                cv2.rectangle(marked_image, 
+                            (int(x1), int(y1)), 
+                            (int(x2), int(y2)), 
+                            (0, 0, 255), 2)
+                
+                # Etiket ekle
+                label = f"Plaka - {conf:.2f}"
+                if readings and readings[index] and readings[index]["text"]:
+                    label = f"{readings[index]['text']} - {conf:.2f}"
+                cv2.putText(marked_image, label, 
+                          (int(x1), int(y1) - 10), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
+        
+        return marked_image
+    
+    @staticmethod
+    def boxes_to_detections(boxes: np.ndarray, readings: Optional[List[Optional[dict]]] = None) -> List[dict]:
+        """(N, 5) kutu dizisini (varsa OCR sonuçlarıyla) yanıt yüküne uygun sözlük listesine çevirir"""
+        keys = ("x1", "y1", "x2", "y2", "confidence")
+        detections = [dict(zip(keys, row)) for row in boxes.astype(np.float64).tolist()]
+        if readings:
+            for detection, reading in zip(detections, readings):
+                if reading is not None:
+                    detection["plate_text"] = reading["text"]
+                    detection["char_confidences"] = reading["char_confidences"]
+        return detections
+    
     def get_model_status(self):
         """Model durumunu kontrol eder"""
+        status_messages = {
+            "not_loaded": "Model henüz yüklenmedi",
+            "loading": "Model yükleniyor",
+            "ready": "Model yüklendi",
+            "failed": "Model yüklenemedi",
+        }
         return {
             "model_loaded": self.model is not None,
             "model_path": settings.MODEL_PATH,
-            "status": "Model yüklendi" if self.model is not None else "Model yüklenemedi"
+            "model_version": self.model_version,
+            "backend": self.model.name if self.model is not None else settings.MODEL_BACKEND,
+            "state": self.state,
+            "stage": self.stage,
+            "progress": self.progress,
+            "load_started_at": self.load_started_at,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.model.warmup_seconds if self.model is not None else None,
+            "ocr_loaded": self.ocr is not None,
+            "model_memory_bytes": self.model_memory_bytes,
+            "registry": self.registry.get_status(),
+            "error": self.load_error,
+            "status": status_messages[self.state]
         }
+
+def _file_mtime(path: str) -> Optional[float]:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
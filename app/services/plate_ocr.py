@@ -0,0 +1,141 @@
+from typing import List, Optional
+import numpy as np
+from app.core.config import settings
+
+class PlateOCR:
+    """
+    CTC çıkışlı (CRNN tipi) ONNX modeli ile plaka metni okur
+
+    Model girdisi (N, C, H, W) float32 [0, 1], çıktısı (N, T, sınıf) ya da
+    (T, N, sınıf) olmalıdır (düzen açılışta bir kez belirlenir); 0. sınıf CTC boşluğu, kalanlar `alphabet` sırasıdır.
+    Kırpmalar decode edilmiş görüntü üzerinde görünüm (view) olarak alınır ve
+    doğrudan önceden ayrılmış batch tamponuna yeniden boyutlandırılır.
+    """
+
+    def __init__(self, model_path: str = None, alphabet: str = None, batch_size: int = None):
+        import onnxruntime as ort
+        self.model_path = model_path or settings.OCR_MODEL_PATH
+        self.alphabet = alphabet or settings.OCR_ALPHABET
+        self.batch_size = batch_size or settings.OCR_BATCH_SIZE
+        options = ort.SessionOptions()
+        if settings.INFERENCE_THREADS > 0:
+            options.intra_op_num_threads = settings.INFERENCE_THREADS
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(self.model_path, options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        _, channels, height, width = model_input.shape
+        self.channels = channels if isinstance(channels, int) else 3
+        self.height = height if isinstance(height, int) else settings.OCR_INPUT_HEIGHT
+        self.width = width if isinstance(width, int) else settings.OCR_INPUT_WIDTH
+        self.dynamic_batch = not isinstance(model_input.shape[0], int)
+        self.time_major = self._detect_time_major(model_input.shape[0])
+
+    def _detect_time_major(self, batch_dim) -> bool:
+        """
+        Çıktının (T, N, sınıf) düzeninde olup olmadığını belirler
+
+        Batch ekseni girdideki boyutla (sayı ya da sembolik ad) eşleşen eksendir; şekilden
+        anlaşılamazsa batch boyutu T'den farklı bir deneme çalıştırması yapılır.
+        """
+        output_shape = self.session.get_outputs()[0].shape
+        if len(output_shape) == 3 and batch_dim is not None:
+            first, second = output_shape[0], output_shape[1]
+            if first == batch_dim and second != batch_dim:
+                return False
+            if second == batch_dim and first != batch_dim:
+                return True
+        size = batch_dim if isinstance(batch_dim, int) else 1
+        probe = np.zeros((size, self.channels, self.height, self.width), dtype=np.float32)
+        first, second = self.session.run(None, {self.input_name: probe})[0].shape[:2]
+        if first == second and self.dynamic_batch:
+            # T == 1 olabilir; farklı bir batch boyutuyla tekrar denenir
+            probe = np.zeros((2, self.channels, self.height, self.width), dtype=np.float32)
+            first, second = self.session.run(None, {self.input_name: probe})[0].shape[:2]
+            size = 2
+        return first != size and second == size
+
+    def read(self, image: np.ndarray, boxes: np.ndarray) -> List[Optional[dict]]:
+        """
+        Görüntüdeki kutuları kırpıp toplu olarak okur
+
+        Args:
+            image: OpenCV formatında (BGR) görüntü
+            boxes: (N, 5) boyutlu [x1, y1, x2, y2, confidence] kutu dizisi
+
+        Returns:
+            List: Her kutu için {"text", "char_confidences"} ya da okunamadıysa None
+        """
+        import cv2
+
+        height, width = image.shape[:2]
+        crops, indices = [], []
+        for index, (x1, y1, x2, y2, _) in enumerate(boxes.tolist()):
+            left, top = max(int(x1), 0), max(int(y1), 0)
+            right, bottom = min(int(round(x2)), width), min(int(round(y2)), height)
+            if right - left < 2 or bottom - top < 2:
+                continue
+            # Dilimleme kopya üretmez, kırpma orijinal tamponu gösterir
+            crops.append(image[top:bottom, left:right])
+            indices.append(index)
+
+        readings: List[Optional[dict]] = [None] * len(boxes)
+        for start in range(0, len(crops), self.batch_size):
+            chunk = crops[start:start + self.batch_size]
+            batch = np.empty((len(chunk), self.height, self.width, 3), dtype=np.uint8)
+            for slot, crop in enumerate(chunk):
+                cv2.resize(crop, (self.width, self.height), dst=batch[slot], interpolation=cv2.INTER_LINEAR)
+            for index, reading in zip(indices[start:start + len(chunk)], self._recognize(batch)):
+                readings[index] = reading
+        return readings
+
+    def _recognize(self, batch: np.ndarray) -> List[dict]:
+        if self.channels == 1:
+            # BGR -> gri: 0.114 B + 0.587 G + 0.299 R
+            tensor = (batch @ np.array([0.114, 0.587, 0.299], dtype=np.float32))[:, None]
+        else:
+            # BGR HWC uint8 -> RGB CHW float32
+            tensor = batch[..., ::-1].transpose(0, 3, 1, 2).astype(np.float32)
+        tensor = np.ascontiguousarray(tensor, dtype=np.float32) / 255.0
+
+        if self.dynamic_batch:
+            logits = self.session.run(None, {self.input_name: tensor})[0]
+        else:
+            logits = np.concatenate([
+                self.session.run(None, {self.input_name: tensor[i:i + 1]})[0] for i in range(len(tensor))
+            ], axis=1 if self.time_major else 0)
+        if self.time_major:
+            # (T, N, sınıf) -> (N, T, sınıf)
+            logits = logits.transpose(1, 0, 2)
+        return [self._ctc_decode(sequence) for sequence in self._softmax(logits)]
+
+    @staticmethod
+    def _softmax(logits: np.ndarray) -> np.ndarray:
+        # Model zaten olasılık döndürüyorsa dokunma
+        if logits.min() >= 0 and np.allclose(logits.sum(axis=-1), 1.0, atol=1e-3):
+            return logits
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+    def _ctc_decode(self, probs: np.ndarray) -> dict:
+        """Açgözlü CTC çözümü; her karakterin güveni kendi zaman adımlarındaki en yüksek olasılıktır"""
+        labels = probs.argmax(axis=1)
+        scores = probs.max(axis=1)
+        text, confidences = [], []
+        previous = 0
+        for label, score in zip(labels.tolist(), scores.tolist()):
+            if label != 0 and label <= len(self.alphabet):
+                if label != previous:
+                    text.append(self.alphabet[label - 1])
+                    confidences.append(score)
+                else:
+                    confidences[-1] = max(confidences[-1], score)
+            previous = label
+        return {"text": "".join(text), "char_confidences": confidences}
+
+    def warmup(self, runs: int):
+        if runs <= 0:
+            return
+        dummy = np.zeros((1, self.height, self.width, 3), dtype=np.uint8)
+        for _ in range(runs):
+            self._recognize(dummy)
@@ -0,0 +1,132 @@
+from typing import List
+import numpy as np
+from app.core.config import settings
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    İki kutu kümesi arasındaki IoU matrisini hesaplar
+
+    Args:
+        a: (N, >=4) boyutlu [x1, y1, x2, y2, ...] dizisi
+        b: (M, >=4) boyutlu [x1, y1, x2, y2, ...] dizisi
+
+    Returns:
+        np.ndarray: (N, M) boyutlu IoU matrisi
+    """
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return inter / np.maximum(union, 1e-6)
+
+class PlateTrack:
+    __slots__ = ("track_id", "box", "best_box", "best_frame", "first_frame", "last_frame", "hits")
+
+    def __init__(self, track_id: int, box: np.ndarray, frame_index: int):
+        self.track_id = track_id
+        self.box = box
+        self.best_box = box
+        self.best_frame = frame_index
+        self.first_frame = frame_index
+        self.last_frame = frame_index
+        self.hits = 1
+
+    def update(self, box: np.ndarray, frame_index: int):
+        self.box = box
+        self.last_frame = frame_index
+        self.hits += 1
+        if box[4] > self.best_box[4]:
+            self.best_box = box
+            self.best_frame = frame_index
+
+    def to_dict(self, fps: float = 0.0):
+        x1, y1, x2, y2, conf = self.best_box.astype(np.float64).tolist()
+        return {
+            "track_id": self.track_id,
+            "first_frame": self.first_frame,
+            "last_frame": self.last_frame,
+            "best_frame": self.best_frame,
+            "first_time": self.first_frame / fps if fps else None,
+            "last_time": self.last_frame / fps if fps else None,
+            "hits": self.hits,
+            "detection": {"x1": x1, "y1": y1, "x2": x2, "y2": y2, "confidence": conf},
+        }
+
+class IoUTracker:
+    """
+    Kareler arası kutuları IoU ile eşleştirip plaka izlerine (track) birleştiren hafif izleyici
+
+    Her plaka için binlerce kare bazlı tespit yerine, en yüksek güvenli karesiyle
+    tek bir iz döner.
+    """
+
+    def __init__(self, iou_threshold: float = None, max_age: int = None, min_hits: int = None):
+        self.iou_threshold = iou_threshold if iou_threshold is not None else settings.TRACKER_IOU_THRESHOLD
+        self.max_age = max_age if max_age is not None else settings.TRACKER_MAX_AGE
+        self.min_hits = min_hits if min_hits is not None else settings.TRACKER_MIN_HITS
+        self._active: List[PlateTrack] = []
+        self._finished: List[PlateTrack] = []
+        self._next_id = 1
+
+    def update(self, frame_index: int, boxes: np.ndarray) -> List[int]:
+        """
+        Yeni karenin kutularını izlere ekler
+
+        Args:
+            frame_index: Karenin videodaki sırası
+            boxes: (N, 5) boyutlu kutu dizisi
+
+        Returns:
+            List[int]: Her kutunun atandığı iz numarası
+        """
+        # Uzun süredir görülmeyen izleri kapat
+        still_active = []
+        for track in self._active:
+            if frame_index - track.last_frame > self.max_age:
+                self._finished.append(track)
+            else:
+                still_active.append(track)
+        self._active = still_active
+
+        assigned = [0] * len(boxes)
+        if len(boxes) == 0:
+            return assigned
+
+        unmatched = set(range(len(boxes)))
+        if self._active:
+            track_boxes = np.stack([track.box for track in self._active])
+            ious = iou_matrix(track_boxes, boxes)
+            # Açgözlü eşleştirme: en yüksek IoU çiftinden başla
+            for flat_index in np.argsort(ious, axis=None)[::-1]:
+                t, d = divmod(int(flat_index), len(boxes))
+                if ious[t, d] < self.iou_threshold:
+                    break
+                track = self._active[t]
+                if d not in unmatched or track.last_frame == frame_index:
+                    continue
+                track.update(boxes[d], frame_index)
+                assigned[d] = track.track_id
+                unmatched.discard(d)
+
+        for d in sorted(unmatched):
+            track = PlateTrack(self._next_id, boxes[d], frame_index)
+            self._next_id += 1
+            self._active.append(track)
+            assigned[d] = track.track_id
+
+        return assigned
+
+    def tracks(self, fps: float = 0.0) -> List[dict]:
+        """En az `min_hits` kez görülen tüm izleri döner"""
+        all_tracks = self._finished + self._active
+        return [
+            track.to_dict(fps)
+            for track in sorted(all_tracks, key=lambda t: t.track_id)
+            if track.hits >= self.min_hits
+        ]
@@ -0,0 +1,102 @@
+from typing import List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+from app.services.inference_backends import EMPTY_BOXES
+
+class TileOptions:
+    """
+    İstek başına parçalı (tiled) çıkarım ayarları
+
+    Görüntünün uzun kenarı `min_side` değerine ulaştığında görüntü `tile_size`
+    boyutunda, `overlap` oranında örtüşen parçalara bölünür. Verilmeyen değerler
+    ayarlardan alınır.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, tile_size: Optional[int] = None,
+                 overlap: Optional[float] = None, min_side: Optional[int] = None):
+        self.enabled = settings.TILING_ENABLED if enabled is None else enabled
+        self.tile_size = tile_size or settings.TILE_SIZE
+        self.overlap = settings.TILE_OVERLAP if overlap is None else overlap
+        self.min_side = settings.TILE_MIN_SIDE if min_side is None else min_side
+
+    def applies(self, shape) -> bool:
+        """Verilen (yükseklik, genişlik) boyutundaki görüntünün parçalanıp parçalanmayacağı"""
+        height, width = shape[:2]
+        return self.enabled and max(height, width) >= self.min_side and max(height, width) > self.tile_size
+
+    @property
+    def cache_tag(self) -> str:
+        """Önbellek anahtarına eklenen etiket; parçalı ve tam kare sonuçları birbirine karışmaz"""
+        if not self.enabled:
+            return ""
+        return f":tiled:{self.tile_size}:{self.overlap}:{self.min_side}"
+
+def _axis_starts(length: int, tile: int, step: int) -> List[int]:
+    """Tek eksende parça başlangıçları; son parça kenara hizalanır"""
+    if length <= tile:
+        return [0]
+    starts = list(range(0, length - tile, step))
+    starts.append(length - tile)
+    return starts
+
+def plan_tiles(height: int, width: int, tile_size: int, overlap: float) -> List[Tuple[int, int, int, int]]:
+    """
+    Görüntüyü kaplayan örtüşen parçaların (x1, y1, x2, y2) koordinatlarını döner
+
+    Komşu parçalar en az `tile_size * overlap` piksel örtüşür; bu genişlikten küçük
+    bir plaka en az bir parçada bütün olarak görünür.
+    """
+    step = max(int(tile_size * (1.0 - overlap)), 1)
+    return [
+        (x, y, min(x + tile_size, width), min(y + tile_size, height))
+        for y in _axis_starts(height, tile_size, step)
+        for x in _axis_starts(width, tile_size, step)
+    ]
+
+def slice_image(image: np.ndarray, tiles: List[Tuple[int, int, int, int]]) -> List[np.ndarray]:
+    """Parçaları kopya almadan görüntünün görünümleri (view) olarak döner"""
+    return [image[y1:y2, x1:x2] for x1, y1, x2, y2 in tiles]
+
+def merge_tile_boxes(tile_boxes: List[np.ndarray], tiles: List[Tuple[int, int, int, int]],
+                     threshold: float, extra: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Parça koordinatlarındaki kutuları orijinal görüntüye taşır ve parçalar arası NMS uygular
+
+    Parça kenarında kesilen bir plaka, komşu parçada bütün olarak bulunan kutunun
+    içinde kalır; IoU bu durumda düşük kalacağı için örtüşme, kesişimin küçük kutunun
+    alanına oranı ile ölçülür.
+
+    Args:
+        tile_boxes: Her parça için (N, 5) kutu dizisi
+        tiles: `plan_tiles` çıktısı
+        threshold: Bu oranın üzerinde örtüşen daha düşük güvenli kutular elenir
+        extra: Zaten orijinal koordinatlarda olan ek kutular (tam kare tahmini)
+
+    Returns:
+        np.ndarray: (N, 5) boyutlu birleştirilmiş kutu dizisi
+    """
+    shifted = [
+        boxes + np.array([x1, y1, x1, y1, 0], dtype=boxes.dtype)
+        for boxes, (x1, y1, _, _) in zip(tile_boxes, tiles) if len(boxes)
+    ]
+    if extra is not None and len(extra):
+        shifted.append(extra)
+    if not shifted:
+        return EMPTY_BOXES
+    boxes = np.concatenate(shifted).astype(np.float32, copy=False)
+    return boxes[_suppress(boxes, threshold)]
+
+def _suppress(boxes: np.ndarray, threshold: float) -> np.ndarray:
+    """Kesişim / küçük alan ölçütüyle açgözlü NMS; tutulan kutuların indekslerini döner"""
+    x1, y1, x2, y2, scores = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3], boxes[:, 4]
+    areas = np.maximum(x2 - x1, 0) * np.maximum(y2 - y1, 0)
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+    while order.size:
+        best, rest = order[0], order[1:]
+        keep.append(best)
+        inter_w = np.maximum(np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest]), 0)
+        inter_h = np.maximum(np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest]), 0)
+        smaller = np.maximum(np.minimum(areas[best], areas[rest]), 1e-6)
+        order = rest[inter_w * inter_h / smaller <= threshold]
+    return np.array(keep, dtype=np.int64)
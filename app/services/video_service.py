@@ -0,0 +1,75 @@
+from typing import List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+
+class MotionGate:
+    """Bir önceki işlenen kareye göre yeterli hareket yoksa kareyi atlatır"""
+
+    def __init__(self, threshold: float = None, size: int = 64):
+        self.threshold = threshold if threshold is not None else settings.VIDEO_MOTION_THRESHOLD
+        self.size = size
+        self._previous: Optional[np.ndarray] = None
+
+    def should_process(self, frame: np.ndarray) -> bool:
+        """
+        Karenin işlenip işlenmeyeceğine karar verir
+
+        Kareler küçük gri tonlu bir özete indirgenir ve ortalama mutlak fark
+        (0-255 ölçeğinde) eşikle karşılaştırılır. Eşik 0 ise her kare işlenir.
+        """
+        if self.threshold <= 0:
+            return True
+        import cv2
+        small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (self.size, self.size),
+                           interpolation=cv2.INTER_AREA)
+        if self._previous is None:
+            self._previous = small
+            return True
+        diff = float(cv2.absdiff(small, self._previous).mean())
+        if diff < self.threshold:
+            return False
+        self._previous = small
+        return True
+
+class VideoFrameReader:
+    """OpenCV VideoCapture ile kareleri atlama ve hareket filtresiyle okur"""
+
+    def __init__(self, path: str, frame_skip: int = None, motion_threshold: float = None):
+        import cv2
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise ValueError("Video açılamadı")
+        self.frame_skip = max(1, frame_skip if frame_skip is not None else settings.VIDEO_FRAME_SKIP)
+        self.motion_gate = MotionGate(motion_threshold)
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 0.0
+        self.frame_index = -1
+        self.frames_read = 0
+        self.frames_sampled = 0
+        self.finished = False
+
+    def read_batch(self, batch_size: int) -> List[Tuple[int, np.ndarray]]:
+        """
+        Bir sonraki en fazla `batch_size` adet örneklenmiş kareyi döner
+
+        Atlanan kareler `grab()` ile yalnızca ilerletilir, decode edilmez.
+        """
+        frames = []
+        while len(frames) < batch_size and not self.finished:
+            self.frame_index += 1
+            if self.frame_index % self.frame_skip != 0:
+                if not self.capture.grab():
+                    self.finished = True
+                continue
+            ok, frame = self.capture.read()
+            if not ok:
+                self.finished = True
+                break
+            self.frames_read += 1
+            if not self.motion_gate.should_process(frame):
+                continue
+            self.frames_sampled += 1
+            frames.append((self.frame_index, frame))
+        return frames
+
+    def release(self):
+        self.capture.release()
@@ -0,0 +1,159 @@
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Dict, List, Optional
+from app.core.config import settings
+
+# Fork'tan önce ayarlanması gereken (kütüphane ilk yüklendiğinde okunan) thread ortam değişkenleri
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+class WorkerSupervisor:
+    """
+    Modeli bir kez yükleyip ısındıran, ardından aynı soketi dinleyen işçileri fork eden süreç
+
+    Ağırlıklar fork'tan önce yüklendiği için işçiler aynı bellek sayfalarını copy-on-write
+    olarak paylaşır; yalnızca okunan tensör sayfaları kopyalanmaz. `gc.freeze()` ile
+    yükleme sırasında oluşan nesneler kalıcı nesile taşınır, böylece işçilerdeki çöp
+    toplayıcı bu nesnelerin başlıklarına yazıp sayfaları kopyalatmaz.
+
+    Üst süreç yükleme ve ısınmayı tek intra-op thread ile yapar: fork'tan önce başlatılan
+    OpenMP / ONNX Runtime thread havuzları çocuk süreçlere taşınmaz ve kilitlenmeye yol açar.
+    Her işçi kendi çekirdek kümesine sabitlenir ve thread sayısı çekirdek / işçi olarak ayarlanır
+    (PyTorch ve OpenCV için; önceden oluşturulan ONNX Runtime oturumları tek thread ile kalır,
+    paralellik süreç sayısından gelir).
+    """
+
+    def __init__(self, app, workers: int, threads_per_worker: int = None, pin_cpus: bool = None):
+        self.app = app
+        self.workers = workers
+        self.cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+        self.threads_per_worker = threads_per_worker or settings.WORKER_THREADS or max(len(self.cpus) // workers, 1)
+        self.pin_cpus = settings.WORKER_CPU_PINNING if pin_cpus is None else pin_cpus
+        self.children: Dict[int, int] = {}
+        self._stopping = False
+        self._socket: Optional[socket.socket] = None
+
+    def worker_cpus(self, index: int) -> List[int]:
+        """İşçiye ayrılan çekirdekler; işçi sayısı çekirdekten fazlaysa çekirdekler paylaşılır"""
+        count = len(self.cpus)
+        if self.threads_per_worker * self.workers <= count:
+            start = index * self.threads_per_worker
+            return self.cpus[start:start + self.threads_per_worker]
+        return [self.cpus[(index * self.threads_per_worker + offset) % count] for offset in range(self.threads_per_worker)]
+
+    def run(self, host: str, port: int):
+        if not hasattr(os, "fork"):
+            print("Bu platform fork desteklemiyor, tek süreçle devam ediliyor")
+            import uvicorn
+            uvicorn.run(self.app, host=host, port=port)
+            return
+
+        self._preload()
+        self._socket = self._bind(host, port)
+        print(f"{self.workers} işçi başlatılıyor ({host}:{port}, işçi başına {self.threads_per_worker} thread)")
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        for index in range(self.workers):
+            self._spawn(index)
+        self._supervise()
+
+    def _preload(self):
+        """Modeli (ve varsa OCR modelini) fork'tan önce tek thread ile yükler ve ısındırır"""
+        for name in _THREAD_ENV_VARS:
+            os.environ.setdefault(name, "1")
+        requested_threads = settings.INFERENCE_THREADS
+        settings.INFERENCE_THREADS = 1
+
+        from app.api.plaka import plaka_service
+        if settings.MODEL_BACKEND == "openvino":
+            # OpenVINO derlenmiş modeli TBB thread'lerine bağlıdır ve fork sonrası kullanılamaz;
+            # bu durumda her işçi modeli kendisi yükler
+            print("OpenVINO arka ucu fork ile paylaşılamaz, model işçilerde ayrı ayrı yüklenecek")
+        else:
+            plaka_service.load()
+            if not plaka_service.is_ready:
+                print(f"Model önceden yüklenemedi, işçiler kendileri deneyecek: {plaka_service.load_error}")
+                plaka_service.state = "not_loaded"
+            else:
+                print(f"Model paylaşım için yüklendi: {plaka_service.model_version}")
+        settings.INFERENCE_THREADS = requested_threads
+        gc.collect()
+        gc.freeze()
+
+    @staticmethod
+    def _bind(host: str, port: int) -> socket.socket:
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _spawn(self, index: int):
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                self._run_worker(index)
+            except BaseException:
+                traceback.print_exc()
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self.children[pid] = index
+
+    def _run_worker(self, index: int):
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        cpus = self.worker_cpus(index)
+        if self.pin_cpus and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cpus)
+        configure_worker_threads(self.threads_per_worker)
+        print(f"İşçi {index} başladı (pid {os.getpid()}, çekirdekler {cpus if self.pin_cpus else 'tümü'})")
+
+        import uvicorn
+        config = uvicorn.Config(self.app, log_level="info")
+        server = uvicorn.Server(config)
+        server.run(sockets=[self._socket])
+
+    def _supervise(self):
+        """Beklenmedik şekilde kapanan işçileri önceden yüklenmiş modelle yeniden fork eder"""
+        while self.children:
+            try:
+                pid, exit_status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            index = self.children.pop(pid, None)
+            if index is None or self._stopping:
+                continue
+            print(f"İşçi {index} kapandı (pid {pid}, durum {exit_status}), yeniden başlatılıyor")
+            time.sleep(1)
+            self._spawn(index)
+
+    def _handle_stop(self, signum, frame):
+        if self._stopping:
+            return
+        self._stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+def configure_worker_threads(threads: int):
+    """İşçi sürecinde yüklü kütüphanelerin intra-op thread sayısını ayarlar"""
+    settings.INFERENCE_THREADS = threads
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads)
+    cv2 = sys.modules.get("cv2")
+    if cv2 is not None:
+        cv2.setNumThreads(threads)
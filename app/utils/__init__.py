@@ -1,3 +1,11 @@
-from .file_utils import cleanup_temp_files
+from .file_utils import cleanup_temp_files, is_archive, iter_archive_images
+from .metrics import Histogram, Counter, Gauge, MetricFamily, REGISTRY
+from .image_utils import negotiate_image_format, encode_image
+from .ttl_cache import TTLCache
 
-__all__ = ["cleanup_temp_files"]
+__all__ = [
+    "cleanup_temp_files", "is_archive", "iter_archive_images",
+    "Histogram", "Counter", "Gauge", "MetricFamily", "REGISTRY",
+    "negotiate_image_format", "encode_image",
+    "TTLCache"
+]
@@ -1,5 +1,11 @@
+import io
 import os
+import tarfile
 import tempfile
+import zipfile
+from typing import Iterator, List, Optional, Tuple
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp", ".tif", ".tiff")
 
 def cleanup_temp_files():
     """Geçici dosyaları temizler"""
@@ -10,3 +16,71 @@ def cleanup_temp_files():
                 os.remove(os.path.join(temp_dir, filename))
             except:
                 pass
+
+
+def is_archive(contents: bytes, filename: str = "") -> bool:
+    """Baytların zip veya tar arşivi olup olmadığını kontrol eder"""
+    if contents[:4] == b"PK\x03\x04":
+        return True
+    # tar başlığında 257. bayttan itibaren "ustar" imzası bulunur
+    if contents[257:262] == b"ustar":
+        return True
+    return filename.lower().endswith((".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz"))
+
+def list_archive_images(contents: bytes, max_files: int) -> List[Tuple[str, int]]:
+    """
+    Zip/tar arşivindeki görüntü dosyalarının (ad, açılmış boyut) listesini içerik açmadan döner
+
+    Args:
+        contents: Arşivin ham baytları
+        max_files: En fazla listelenecek görüntü sayısı
+    """
+    return [(name, size) for name, size, _ in _iter_members(contents, max_files)]
+
+def iter_archive_images(contents: bytes, max_files: int,
+                        max_member_bytes: Optional[int] = None) -> Iterator[Tuple[str, Optional[bytes]]]:
+    """
+    Zip/tar arşivindeki görüntü dosyalarını (ad, baytlar) olarak sırayla, tek tek açarak döner
+
+    Açılmış boyutu `max_member_bytes` sınırını aşan dosyalar açılmaz, baytlar yerine
+    None döner. Okuma sınırın bir bayt fazlasıyla kesildiği için başlıkta küçük
+    görünen bir dosya da belleği şişiremez.
+
+    Args:
+        contents: Arşivin ham baytları
+        max_files: En fazla okunacak görüntü sayısı
+        max_member_bytes: Dosya başına açılmış bayt sınırı
+    """
+    for name, size, open_member in _iter_members(contents, max_files):
+        if max_member_bytes is not None and size > max_member_bytes:
+            yield name, None
+            continue
+        with open_member() as member:
+            data = member.read(max_member_bytes + 1 if max_member_bytes is not None else -1)
+        if max_member_bytes is not None and len(data) > max_member_bytes:
+            yield name, None
+            continue
+        yield name, data
+
+def _iter_members(contents: bytes, max_files: int):
+    """Arşivdeki görüntüler için (ad, açılmış boyut, açıcı) üçlülerini döner"""
+    count = 0
+    if contents[:4] == b"PK\x03\x04":
+        with zipfile.ZipFile(io.BytesIO(contents)) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                if count >= max_files:
+                    return
+                count += 1
+                yield info.filename, info.file_size, lambda info=info: archive.open(info)
+        return
+
+    with tarfile.open(fileobj=io.BytesIO(contents), mode="r:*") as archive:
+        for member in archive:
+            if not member.isfile() or not member.name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            if count >= max_files:
+                return
+            count += 1
+            yield member.name, member.size, lambda member=member: archive.extractfile(member)
@@ -0,0 +1,153 @@
+from typing import List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+from app.utils.tracing import stage
+
+# Desteklenen çıktı formatları: format adı -> (uzantı, media type)
+IMAGE_FORMATS = {
+    "jpeg": (".jpg", "image/jpeg"),
+    "webp": (".webp", "image/webp"),
+    "png": (".png", "image/png"),
+}
+
+# Yüklemelerde kabul edilen formatların dosya imzaları (magic bytes)
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"BM", "bmp"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+)
+
+_FORMAT_ALIASES = {"jpg": "jpeg", "image/jpeg": "jpeg", "image/jpg": "jpeg",
+                   "image/webp": "webp", "image/png": "png"}
+
+def parse_accept(accept: Optional[str]) -> List[str]:
+    """Accept başlığındaki media type'ları q değerine göre sıralı döner (q=0 olanlar hariç)"""
+    if not accept:
+        return []
+    candidates = []
+    for index, part in enumerate(accept.split(",")):
+        media_type, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        candidates.append((-q, index, media_type.strip().lower()))
+    return [media_type for neg_q, _, media_type in sorted(candidates) if neg_q < 0]
+
+def negotiate_image_format(requested: Optional[str] = None, accept: Optional[str] = None) -> Optional[str]:
+    """
+    Çıktı formatını sorgu parametresi ya da Accept başlığından belirler
+
+    Args:
+        requested: `format` sorgu parametresi (jpeg, webp, png)
+        accept: İsteğin Accept başlığı
+
+    Returns:
+        str: Format adı; desteklenmeyen bir format istenmişse None
+    """
+    if requested:
+        name = requested.lower()
+        name = _FORMAT_ALIASES.get(name, name)
+        return name if name in IMAGE_FORMATS else None
+
+    # q değerine göre sıralı, ilk desteklenen formatı seç
+    for media_type in parse_accept(accept):
+        name = _FORMAT_ALIASES.get(media_type)
+        if name is not None:
+            return name
+
+    return settings.IMAGE_OUTPUT_FORMAT
+
+def encode_image(image: np.ndarray, image_format: str = "jpeg", quality: Optional[int] = None) -> Tuple[bytes, str, str]:
+    """
+    Görüntüyü bellekte istenen formata kodlar
+
+    Args:
+        image: OpenCV formatında görüntü
+        image_format: jpeg, webp veya png
+        quality: JPEG/WebP için 1-100 arası kalite, PNG için 0-9 arası sıkıştırma seviyesi
+
+    Returns:
+        Tuple: (kodlanmış baytlar, media type, dosya uzantısı)
+    """
+    import cv2
+    
+    extension, media_type = IMAGE_FORMATS[image_format]
+    if image_format == "jpeg":
+        params = [cv2.IMWRITE_JPEG_QUALITY, quality if quality is not None else settings.JPEG_QUALITY]
+    elif image_format == "webp":
+        params = [cv2.IMWRITE_WEBP_QUALITY, quality if quality is not None else settings.WEBP_QUALITY]
+    else:
+        params = [cv2.IMWRITE_PNG_COMPRESSION, quality if quality is not None else settings.PNG_COMPRESSION]
+
+    with stage("encode"):
+        success, buffer = cv2.imencode(extension, image, params)
+    if not success:
+        raise ValueError("Görüntü kodlanamadı")
+    return buffer.tobytes(), media_type, extension
+
+def sniff_image_format(header: bytes) -> Optional[str]:
+    """
+    Dosyanın ilk baytlarından görüntü formatını belirler
+
+    Content-Type başlığına güvenilmez; yalnızca OpenCV'nin çözebildiği formatlar kabul edilir.
+
+    Returns:
+        str: jpeg, png, webp, bmp veya tiff; tanınmazsa None
+    """
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    for signature, name in _SIGNATURES:
+        if header.startswith(signature):
+            return name
+    return None
+
+def jpeg_dimensions(contents: bytes) -> Optional[Tuple[int, int]]:
+    """JPEG başlığındaki SOF segmentinden (genişlik, yükseklik) okur; decode etmez"""
+    index = 2
+    length = len(contents)
+    while index + 9 < length:
+        if contents[index] != 0xFF:
+            return None
+        marker = contents[index + 1]
+        if marker == 0xFF:
+            index += 1
+            continue
+        # Uzunluk alanı olmayan işaretler (RSTn, SOI, TEM)
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            index += 2
+            continue
+        # SOF0-SOF15 (DHT, JPG ve DAC hariç)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height = int.from_bytes(contents[index + 5:index + 7], "big")
+            width = int.from_bytes(contents[index + 7:index + 9], "big")
+            return width, height
+        if marker == 0xDA:
+            return None
+        index += 2 + int.from_bytes(contents[index + 2:index + 4], "big")
+    return None
+
+def reduced_decode_factor(contents: bytes, target_side: int) -> int:
+    """
+    JPEG'i DCT ölçekleme ile kaç kat küçük decode etmenin güvenli olduğunu hesaplar
+
+    Küçültülmüş görüntünün uzun kenarı `target_side` altına düşmeyecek en büyük
+    faktör (1, 2, 4 veya 8) seçilir. Diğer formatlarda OpenCV önce tam çözünürlükte
+    decode ettiği için kazanç yoktur ve 1 döner.
+    """
+    if target_side <= 0 or sniff_image_format(contents[:12]) != "jpeg":
+        return 1
+    dimensions = jpeg_dimensions(contents)
+    if dimensions is None:
+        return 1
+    long_side = max(dimensions)
+    for factor in (8, 4, 2):
+        if long_side / factor >= target_side:
+            return factor
+    return 1
@@ -0,0 +1,171 @@
+import os
+import sys
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+class Histogram:
+    """Sabit kovalı (bucket), thread-safe basit histogram"""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, buckets: Sequence[float], description: str = ""):
+        self.name = name
+        self.description = description
+        self.buckets = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Yeni bir ölçüm ekler"""
+        with self._lock:
+            self._sum += value
+            self._count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+                    return
+            self._counts[-1] += 1
+
+    def snapshot(self):
+        """Kümülatif kova sayılarını, toplamı ve adedi döner"""
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(self.buckets, self._counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            buckets["+Inf"] = cumulative + self._counts[-1]
+            return {
+                "name": self.name,
+                "description": self.description,
+                "buckets": buckets,
+                "count": self._count,
+                "sum": self._sum,
+            }
+
+    def render(self, labels: dict = None) -> List[str]:
+        """Prometheus metin formatında kova, toplam ve adet satırlarını üretir"""
+        snapshot = self.snapshot()
+        labels = labels or {}
+        lines = [
+            f"{self.name}_bucket{_format_labels(labels, le=bound)} {count}"
+            for bound, count in snapshot["buckets"].items()
+        ]
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {snapshot['sum']}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {snapshot['count']}")
+        return lines
+
+class Counter:
+    """Yalnızca artan sayaç; `func` verilirse değer okuma anında ondan alınır"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, description: str = "", func: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.description = description
+        self.func = func
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def value(self) -> float:
+        if self.func is not None:
+            return self.func()
+        return self._value
+
+    def render(self, labels: dict = None) -> List[str]:
+        return [f"{self.name}{_format_labels(labels or {})} {self.value()}"]
+
+class Gauge(Counter):
+    """Artıp azalabilen anlık değer (kuyruk derinliği, bellek vb.)"""
+
+    metric_type = "gauge"
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float):
+        with self._lock:
+            self._value = value
+
+class MetricFamily:
+    """Aynı isimli, etiketleri farklı metrikleri (ör. aşama başına histogram) bir arada tutar"""
+
+    def __init__(self, factory: Callable[[], object], name: str, description: str, label_names: Sequence[str]):
+        self.factory = factory
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.metric_type = factory().metric_type
+        self._children: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Etiket değerlerine ait alt metriği döner, yoksa oluşturur"""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self.factory())
+        return child
+
+    def render(self, labels: dict = None) -> List[str]:
+        lines = []
+        for values, child in list(self._children.items()):
+            lines.extend(child.render(dict(zip(self.label_names, values))))
+        return lines
+
+class MetricsRegistry:
+    """/metrics endpoint'inde yayınlanacak metriklerin listesi"""
+
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if all(existing is not metric for existing in self._metrics):
+                self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Tüm metrikleri Prometheus metin formatında (0.0.4) döner"""
+        lines = []
+        for metric in list(self._metrics):
+            metric_type = getattr(metric, "metric_type", "histogram")
+            if metric.description:
+                lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric_type}")
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                lines.append(f"# {metric.name} okunamadı: {e}")
+        return "\n".join(lines) + "\n"
+
+def _format_labels(labels: dict, **extra) -> str:
+    labels = {**labels, **extra}
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + "}"
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def process_rss_bytes() -> int:
+    """Sürecin o anki yerleşik bellek (RSS) kullanımını bayt olarak döner"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        # /proc olmayan sistemlerde en yüksek RSS ile yetinilir (macOS bayt, Linux KB döner)
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == "darwin" else usage * 1024
+
+# Uygulama genelindeki metrik kaydı
+REGISTRY = MetricsRegistry()
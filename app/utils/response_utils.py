@@ -0,0 +1,123 @@
+import hashlib
+import json
+from typing import Dict, Optional
+from urllib.parse import quote
+import numpy as np
+from fastapi.responses import Response
+from app.utils.image_utils import parse_accept
+from app.utils.tracing import stage
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Tespit sonuçları için desteklenen çıktı formatları: format adı -> media type
+DETECTION_FORMATS = {
+    "json": "application/json",
+    "msgpack": "application/msgpack",
+    "boxes": "application/x-plaka-boxes",
+}
+
+_DETECTION_ALIASES = {
+    "application/json": "json",
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack",
+    "application/x-plaka-boxes": "boxes",
+    "application/octet-stream": "boxes",
+}
+
+# Paketlenmiş float32 formatında her kutunun alan sırası
+BOX_FIELDS = "x1,y1,x2,y2,confidence"
+
+def dumps_json(payload) -> bytes:
+    """orjson kuruluysa onunla, değilse standart json modülüyle UTF-8 JSON üretir"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def negotiate_detection_format(accept: Optional[str] = None) -> str:
+    """
+    Tespit yanıtının formatını Accept başlığından belirler
+
+    msgpack kurulu değilse MessagePack istekleri sıradaki uygun formata düşer;
+    hiçbir format eşleşmezse JSON döner.
+
+    Returns:
+        str: json, msgpack veya boxes
+    """
+    for media_type in parse_accept(accept):
+        name = _DETECTION_ALIASES.get(media_type)
+        if name == "msgpack" and msgpack is None:
+            continue
+        if name is not None:
+            return name
+    return "json"
+
+def detection_response(payload: dict, boxes: np.ndarray, detection_format: str = "json") -> Response:
+    """
+    Tespit sonucunu Pydantic doğrulamasına girmeden istenen formatta kodlar
+
+    Args:
+        payload: PlakaResponse ile aynı yapıdaki sözlük
+        boxes: (N, 5) kutu dizisi; `boxes` formatında doğrudan gövdeye yazılır
+        detection_format: `negotiate_detection_format` sonucu
+
+    Returns:
+        Response: JSON, MessagePack ya da little-endian float32 (N, 5) gövdeli yanıt
+    """
+    headers = {"Vary": "Accept"}
+    with stage("serialize"):
+        if detection_format == "boxes":
+            # Gövde N * 5 adet float32'dir; OCR alanları bu formatta yer almaz
+            content = np.ascontiguousarray(boxes, dtype="<f4").tobytes()
+            headers["X-Detections-Count"] = str(len(boxes))
+            headers["X-Box-Fields"] = BOX_FIELDS
+        elif detection_format == "msgpack":
+            content = msgpack.packb(payload)
+        else:
+            content = dumps_json(payload)
+    return Response(content=content, media_type=DETECTION_FORMATS[detection_format], headers=headers)
+
+def content_disposition(filename: str) -> str:
+    """
+    Ek (attachment) başlığını latin-1 dışı karakterler içeren dosya adları için güvenle üretir
+
+    Başlık değerleri latin-1 kodlandığından Türkçe karakterler ASCII yedek adda `_`
+    ile değiştirilir, gerçek ad RFC 5987 `filename*` parametresinde UTF-8 olarak verilir.
+    """
+    fallback = "".join(
+        "\\" + char if char in '"\\' else char if 32 <= ord(char) < 127 else "_"
+        for char in filename
+    )
+    return f"attachment; filename=\"{fallback}\"; filename*=utf-8''{quote(filename, safe='')}"
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match başlığının ETag ile eşleşip eşleşmediği (zayıf karşılaştırma)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def etag_response(payload, if_none_match: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    JSON yanıtı gövdenin özetinden üretilen ETag ile döner
+
+    İstemcinin If-None-Match başlığı ETag ile eşleşirse gövdesiz 304 döner;
+    sorgu yine çalışır ama yanıt gövdesi gönderilmez ve istemci tekrar ayrıştırmaz.
+    """
+    with stage("serialize"):
+        content = dumps_json(payload)
+    etag = f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+    headers = {**(headers or {}), "ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
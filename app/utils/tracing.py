@@ -0,0 +1,103 @@
+import time
+from contextlib import contextmanager, nullcontext
+from app.core.config import settings
+from app.utils.metrics import REGISTRY, Counter, Gauge, Histogram, MetricFamily
+
+_LATENCY_BUCKETS_SECONDS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+STAGE_DURATION = REGISTRY.register(MetricFamily(
+    lambda: Histogram("plaka_stage_duration_seconds", _LATENCY_BUCKETS_SECONDS),
+    "plaka_stage_duration_seconds",
+    "İstek aşamalarının süresi (upload_read, decode, inference, postprocess, annotate, encode, serialize, user_lookup...)",
+    ("stage",),
+))
+
+REQUEST_DURATION = REGISTRY.register(MetricFamily(
+    lambda: Histogram("http_request_duration_seconds", _LATENCY_BUCKETS_SECONDS),
+    "http_request_duration_seconds",
+    "HTTP isteklerinin uçtan uca süresi",
+    ("method", "route"),
+))
+
+REQUESTS_TOTAL = REGISTRY.register(MetricFamily(
+    lambda: Counter("http_requests_total"),
+    "http_requests_total",
+    "Yanıtlanan HTTP istek sayısı",
+    ("method", "route", "status"),
+))
+
+REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge("http_requests_in_flight", "Şu anda işlenen HTTP istek sayısı"))
+
+_tracer = None
+
+def _get_tracer():
+    """OpenTelemetry kuruluysa tracer döner; kurulu değilse bir kez denenip None döner"""
+    global _tracer
+    if _tracer is None:
+        try:
+            from opentelemetry import trace
+            _tracer = trace.get_tracer("gyk-backend")
+        except ImportError:
+            _tracer = False
+    return _tracer or None
+
+def _span(name: str):
+    """TRACING_ENABLED açıksa OpenTelemetry span'i, değilse boş bir context döner"""
+    tracer = _get_tracer() if settings.TRACING_ENABLED else None
+    return tracer.start_as_current_span(name) if tracer is not None else nullcontext()
+
+@contextmanager
+def stage(name: str):
+    """
+    Bloğun süresini aşama histogramına yazar
+
+    TRACING_ENABLED açıksa ve opentelemetry kuruluysa aynı blok için span da açılır.
+    Ek maliyet bir perf_counter çifti ve kilitli bir sayaç artışıdır.
+    """
+    if not settings.METRICS_ENABLED:
+        yield
+        return
+
+    with _span(name):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            STAGE_DURATION.labels(name).observe(time.perf_counter() - started_at)
+
+class MetricsMiddleware:
+    """
+    İstek süresini, durum kodunu ve eşzamanlı istek sayısını ölçen ASGI middleware
+
+    BaseHTTPMiddleware yerine saf ASGI olarak yazıldı; yanıt gövdesi tamponlanmaz ve
+    akış (streaming) yanıtları etkilenmez. Rota etiketi olarak eşleşen yol şablonu
+    (ör. /jobs/{job_id}) kullanılır, böylece etiket sayısı sınırlı kalır.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        started_at = time.perf_counter()
+        try:
+            with _span(f"{scope['method']} {scope['path']}"):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            REQUEST_DURATION.labels(scope["method"], path).observe(time.perf_counter() - started_at)
+            REQUESTS_TOTAL.labels(scope["method"], path, str(status_code)).inc()
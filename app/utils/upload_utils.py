@@ -0,0 +1,158 @@
+import json
+from typing import Dict, Optional
+from fastapi import HTTPException, UploadFile, status
+from app.core.config import settings
+from app.utils.image_utils import sniff_image_format
+
+def format_size(size: int) -> str:
+    """Bayt sayısını hata mesajları için MB, KB ya da bayt olarak yazar"""
+    if size >= 1024 * 1024:
+        megabytes = size / (1024 * 1024)
+        return f"{megabytes:.0f} MB" if megabytes >= 10 or size % (1024 * 1024) == 0 else f"{megabytes:.1f} MB"
+    if size >= 1024:
+        return f"{size // 1024} KB"
+    return f"{size} bayt"
+
+def payload_too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Dosya boyutu sınırı aşıldı (en fazla {format_size(max_bytes)})"
+    )
+
+def unsupported_image() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Desteklenmeyen görüntü formatı (jpeg, png, webp, bmp veya tiff gönderin)"
+    )
+
+async def read_upload(file: UploadFile, max_bytes: Optional[int] = None, require_image: bool = True) -> bytes:
+    """
+    Yüklenen dosyayı parça parça okur, boyut sınırını ve dosya imzasını kontrol eder
+
+    Content-Type başlığına güvenilmez; ilk parça okunduğunda imza tanınmıyorsa 415,
+    sınır aşılır aşılmaz 413 döner. Starlette form alanlarını uç nokta çalışmadan önce
+    ayrıştırdığından gövde bu noktada zaten alınmıştır; büyük gövdeleri akış sırasında
+    kesmek `BodySizeLimitMiddleware`'in işidir.
+
+    Args:
+        file: Yüklenen dosya
+        max_bytes: Dosya başına bayt sınırı (varsayılan: UPLOAD_MAX_BYTES)
+        require_image: False ise imza kontrolü yapılmaz (arşivler için)
+
+    Returns:
+        bytes: Dosyanın içeriği
+    """
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    chunks = []
+    total = 0
+    while True:
+        chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        if not chunks and require_image and sniff_image_format(chunk[:12]) is None:
+            raise unsupported_image()
+        total += len(chunk)
+        if total > max_bytes:
+            raise payload_too_large(max_bytes)
+        chunks.append(chunk)
+    if total == 0 and require_image:
+        raise unsupported_image()
+    return b"".join(chunks)
+
+# Tek görüntü alan uç noktalar; gövdeleri REQUEST_MAX_BODY_BYTES yerine UPLOAD_MAX_BYTES'a göre sınırlanır
+SINGLE_UPLOAD_PATHS = ("/plaka/detect", "/plaka/detect-image", "/jobs")
+
+def single_upload_limits() -> Dict[str, int]:
+    """Tek görüntü alan uç noktalar için yol -> dosya boyutu sınırı eşlemesi"""
+    return {path: settings.UPLOAD_MAX_BYTES for path in SINGLE_UPLOAD_PATHS}
+
+class _BodyTooLarge(HTTPException):
+    """Gövde okunurken sınır aşıldı; FastAPI bunu diğer HTTPException'lar gibi 413 yanıtına çevirir"""
+
+    def __init__(self, max_bytes: int):
+        error = payload_too_large(max_bytes)
+        super().__init__(status_code=error.status_code, detail=error.detail)
+
+class BodySizeLimitMiddleware:
+    """
+    İstek gövdesini akış sırasında sayan ve sınır aşıldığında 413 dönen ASGI middleware
+
+    Content-Length sınırı aşıyorsa gövde hiç okunmaz; başlık yoksa (chunked) gövde
+    multipart ayrıştırıcısına akarken sayılır ve sınır aşıldığı anda kesilir, böylece
+    büyük yüklemeler diske ya da belleğe tamamen yazılmadan reddedilir.
+
+    `route_limits` içindeki yollara (varsayılan: tek görüntü alan uç noktalar) gelen
+    POST istekleri genel sınır yerine o yolun dosya sınırı artı
+    `UPLOAD_FORM_OVERHEAD_BYTES` ile sınırlanır.
+    """
+
+    def __init__(self, app, max_bytes: Optional[int] = None, route_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_bytes = max_bytes or settings.REQUEST_MAX_BODY_BYTES
+        self.route_limits = single_upload_limits() if route_limits is None else route_limits
+
+    def _limits(self, scope):
+        """İsteğin gövde sınırını ve hata mesajında gösterilecek sınırı döner"""
+        if scope.get("method") == "POST":
+            file_limit = self.route_limits.get(scope["path"].rstrip("/"))
+            if file_limit:
+                return file_limit + settings.UPLOAD_FORM_OVERHEAD_BYTES, file_limit
+        return self.max_bytes, self.max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        max_bytes, reported = self._limits(scope)
+        if max_bytes <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", ()):
+            if name == b"content-length":
+                try:
+                    too_large = int(value) > max_bytes
+                except ValueError:
+                    too_large = False
+                if too_large:
+                    await self._reject(send, reported)
+                    return
+                break
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise _BodyTooLarge(reported)
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            if not response_started:
+                await self._reject(send, reported)
+
+    async def _reject(self, send, max_bytes: int):
+        error = payload_too_large(max_bytes)
+        body = json.dumps({"detail": error.detail}, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": error.status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
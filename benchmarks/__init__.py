@@ -0,0 +1,6 @@
+"""
+Plaka işlem hattı için benchmark ve yük testi araçları
+
+GPU, ağ ya da model dosyası gerekmez: sentetik görüntüler ve küçük bir yer tutucu
+model kullanılır. Çalıştırmak için: python -m benchmarks run --output sonuc.json
+"""
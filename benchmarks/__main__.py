@@ -0,0 +1,155 @@
+import argparse
+import json
+
+from benchmarks.stats import compare, environment
+
+def run(args):
+    from app.core.config import settings
+    from app.services.inference_backends import create_backend
+    from benchmarks.load import benchmark_load, prepare_app
+    from benchmarks.stages import benchmark_stages
+    from benchmarks.synthetic import StandInBackend, make_dataset
+
+    payloads = make_dataset(args.images, args.width, args.height, seed=args.seed)
+    if args.backend == "stand-in":
+        backend = StandInBackend(settings.MODEL_IMGSZ, compute_ms=args.compute_ms)
+    else:
+        backend = create_backend(args.backend, args.model)
+        backend.warmup(settings.MODEL_WARMUP_RUNS)
+
+    results = {
+        "environment": environment(),
+        "config": {
+            "backend": backend.name,
+            "images": args.images,
+            "width": args.width,
+            "height": args.height,
+            "seed": args.seed,
+            "compute_ms": args.compute_ms,
+            "cache": args.cache,
+        },
+    }
+
+    if args.stage_runs > 0:
+        results["stages"] = benchmark_stages(backend, payloads, args.stage_runs, args.confidence)
+        for stage, summary in results["stages"].items():
+            print(f"{stage}: p50={summary['p50_ms']} ms, p95={summary['p95_ms']} ms, p99={summary['p99_ms']} ms")
+
+    if args.requests > 0:
+        app = prepare_app(backend, use_cache=args.cache)
+        results["load"] = benchmark_load(
+            app,
+            endpoints=[endpoint.strip() for endpoint in args.endpoints.split(",")],
+            payloads=payloads,
+            concurrency_levels=[int(level) for level in args.concurrency.split(",")],
+            requests=args.requests,
+            warmup=args.warmup,
+            confidence=args.confidence,
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Sonuçlar yazıldı: {args.output}")
+
+def run_backends(args):
+    import cv2
+    import numpy as np
+    from benchmarks.backends import benchmark_backends
+    from benchmarks.synthetic import make_dataset
+
+    if args.image:
+        image = cv2.imread(args.image, cv2.IMREAD_COLOR)
+        if image is None:
+            raise SystemExit(f"Görüntü okunamadı: {args.image}")
+    else:
+        payload = make_dataset(1, args.width, args.height, seed=args.seed)[0]
+        image = cv2.imdecode(np.frombuffer(payload, np.uint8), cv2.IMREAD_COLOR)
+
+    names = [name.strip() for name in args.backends.split(",")]
+    results = {
+        "environment": environment(),
+        "config": {
+            "model": args.model,
+            "image": args.image,
+            "width": image.shape[1],
+            "height": image.shape[0],
+            "runs": args.runs,
+            "batch_size": args.batch_size,
+        },
+        "backends": benchmark_backends(names, args.model, image, args.runs, args.batch_size, args.warmup),
+    }
+    for result in results["backends"]:
+        if "error" in result:
+            print(f"{result['backend']}: {result['error']}")
+        else:
+            latency = result["latency"]
+            print(f"{result['backend']}: p50={latency['p50_ms']} ms, p95={latency['p95_ms']} ms, "
+                  f"{result['images_per_second']} görüntü/sn")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Sonuçlar yazıldı: {args.output}")
+
+def run_compare(args):
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    print(f"{baseline['environment'].get('commit')} -> {candidate['environment'].get('commit')}")
+    for name, metric, old, new, change in compare(baseline, candidate):
+        print(f"{name:45} {metric:20} {old:>10} -> {new:>10} ({change:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Plaka işlem hattı benchmark'ları")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Aşama ve yük ölçümlerini çalıştırır")
+    run_parser.add_argument("--backend", default="stand-in", help="stand-in, ultralytics, onnx veya openvino")
+    run_parser.add_argument("--model", default=None, help="Gerçek arka uç için model yolu (varsayılan: MODEL_PATH)")
+    run_parser.add_argument("--compute-ms", type=float, default=0.0, help="Yer tutucu modelin ek hesaplama süresi")
+    run_parser.add_argument("--images", type=int, default=32, help="Sentetik görüntü sayısı")
+    run_parser.add_argument("--width", type=int, default=1280)
+    run_parser.add_argument("--height", type=int, default=720)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--confidence", type=float, default=0.5)
+    run_parser.add_argument("--stage-runs", type=int, default=100, help="Aşama ölçümü tekrar sayısı (0: atla)")
+    run_parser.add_argument("--endpoints", default="/plaka/detect,/plaka/detect-image")
+    run_parser.add_argument("--concurrency", default="1,4,16", help="Virgülle ayrılmış eşzamanlılık seviyeleri")
+    run_parser.add_argument("--requests", type=int, default=200, help="Seviye başına istek sayısı (0: atla)")
+    run_parser.add_argument("--warmup", type=int, default=5)
+    run_parser.add_argument("--cache", action="store_true", help="Tespit önbelleğini açık bırakır")
+    run_parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    run_parser.set_defaults(handler=run)
+
+    backends_parser = commands.add_parser("backends", help="Model arka uçlarını aynı koşullarda karşılaştırır")
+    backends_parser.add_argument("--image", help="Test görüntüsü (verilmezse sentetik görüntü kullanılır)")
+    backends_parser.add_argument("--model", default=None, help="Model yolu (varsayılan: MODEL_PATH)")
+    backends_parser.add_argument("--backends", default="ultralytics,onnx,openvino", help="Virgülle ayrılmış arka uç listesi")
+    backends_parser.add_argument("--runs", type=int, default=20)
+    backends_parser.add_argument("--batch-size", type=int, default=1)
+    backends_parser.add_argument("--warmup", type=int, default=None, help="Isınma çıkarımı sayısı (varsayılan: MODEL_WARMUP_RUNS)")
+    backends_parser.add_argument("--width", type=int, default=1280)
+    backends_parser.add_argument("--height", type=int, default=720)
+    backends_parser.add_argument("--seed", type=int, default=0)
+    backends_parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    backends_parser.set_defaults(handler=run_backends)
+
+    compare_parser = commands.add_parser("compare", help="İki sonuç dosyasını karşılaştırır")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.set_defaults(handler=run_compare)
+
+    args = parser.parse_args()
+    if args.command in ("run", "backends") and args.model is None:
+        from app.core.config import settings
+        args.model = settings.MODEL_PATH
+    if args.command == "backends" and args.warmup is None:
+        from app.core.config import settings
+        args.warmup = settings.MODEL_WARMUP_RUNS
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import time
+from typing import List
+import numpy as np
+
+from app.services.inference_backends import create_backend
+from benchmarks.stats import summarize
+
+def benchmark_backend(name: str, model_path: str, image: np.ndarray, runs: int,
+                      batch_size: int = 1, warmup: int = 0) -> dict:
+    """
+    Tek bir model arka ucunu aynı görüntü ve parametrelerle ölçer
+
+    Arka uç kurulu değilse `create_backend` başka bir arka uca düşer; bu durumda
+    ölçüm yapılmaz, sonuçta hata olarak raporlanır.
+    """
+    started_at = time.perf_counter()
+    backend = create_backend(name, model_path)
+    load_seconds = time.perf_counter() - started_at
+    if backend.name != name:
+        return {"backend": name, "error": f"kurulu değil, {backend.name} arka ucuna düşüldü"}
+
+    backend.warmup(warmup)
+    batch = [image] * batch_size
+    latencies = []
+    detections = 0
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        results = backend.predict(batch)
+        latencies.append((time.perf_counter() - started_at) * 1000.0)
+        detections = sum(len(boxes) for boxes in results)
+
+    latency = summarize(latencies)
+    return {
+        "backend": name,
+        "load_seconds": round(load_seconds, 3),
+        "warmup_seconds": round(backend.warmup_seconds, 3),
+        "batch_size": batch_size,
+        "latency": latency,
+        "images_per_second": round(batch_size * 1000.0 / latency["mean_ms"], 2) if runs else None,
+        "detections_per_batch": detections,
+    }
+
+def benchmark_backends(names: List[str], model_path: str, image: np.ndarray, runs: int,
+                       batch_size: int = 1, warmup: int = 0) -> List[dict]:
+    """Arka uçları sırayla ölçer; yüklenemeyen arka uç hata satırı olarak döner"""
+    results = []
+    for name in names:
+        try:
+            result = benchmark_backend(name, model_path, image, runs, batch_size, warmup)
+        except Exception as e:
+            result = {"backend": name, "error": str(e)}
+        results.append(result)
+    return results
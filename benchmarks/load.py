@@ -0,0 +1,88 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import List, Sequence
+
+from app.services.inference_backends import InferenceBackend
+from benchmarks.stats import summarize
+
+def prepare_app(backend: InferenceBackend, use_cache: bool = False):
+    """
+    FastAPI uygulamasını veritabanı ve model dosyası olmadan ölçülebilir hale getirir
+
+    Model yerine verilen arka uç takılır, kimlik doğrulama sabit bir kullanıcıyla
+    değiştirilir, kullanıcı kotaları ve tespit geçmişi yazımı kapatılır. Böylece
+    ölçülen süre yalnızca istek yolunun kendisidir.
+    """
+    from main import app
+    from app.api.plaka import plaka_service, fair_scheduler, detection_cache, detection_writer
+    from app.core.security import get_current_user
+    from app.services.model_registry import ModelEntry
+    from app.services.plaka_service import DEFAULT_MODEL
+
+    plaka_service.registry.add(ModelEntry(DEFAULT_MODEL, backend, "benchmark", f"{backend.name}:benchmark"), activate=True)
+    plaka_service.state = "ready"
+    detection_writer.enabled = False
+    # Tüm istekler tek bir kullanıcıdan geldiği için kotalar ölçümü kısıtlamasın
+    fair_scheduler.enabled = False
+    detection_cache.enabled = use_cache
+
+    user = SimpleNamespace(id="benchmark", username="benchmark", email="benchmark@example.com", is_active=True)
+    app.dependency_overrides[get_current_user] = lambda: user
+    return app
+
+async def _run_level(client, endpoint: str, payloads: List[bytes], concurrency: int,
+                     requests: int, confidence: float) -> dict:
+    latencies: List[float] = []
+    status_codes = {}
+    counter = iter(range(requests))
+
+    async def worker():
+        for index in counter:
+            files = {"file": ("plate.jpg", payloads[index % len(payloads)], "image/jpeg")}
+            started_at = time.perf_counter()
+            response = await client.post(endpoint, params={"confidence": confidence}, files=files)
+            await response.aread()
+            latencies.append((time.perf_counter() - started_at) * 1000.0)
+            status_codes[response.status_code] = status_codes.get(response.status_code, 0) + 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": requests,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 2),
+        "status_codes": {str(code): count for code, count in sorted(status_codes.items())},
+        "latency": summarize(latencies),
+    }
+
+async def _run_load(app, endpoints: Sequence[str], payloads: List[bytes], concurrency_levels: Sequence[int],
+                    requests: int, warmup: int, confidence: float) -> list:
+    import httpx
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60.0) as client:
+        for endpoint in endpoints:
+            if warmup > 0:
+                await _run_level(client, endpoint, payloads, 1, warmup, confidence)
+            for concurrency in concurrency_levels:
+                result = await _run_level(client, endpoint, payloads, concurrency, requests, confidence)
+                print(f"{endpoint} c={concurrency}: {result['requests_per_second']} req/s, "
+                      f"p50={result['latency'].get('p50_ms')} ms, p99={result['latency'].get('p99_ms')} ms")
+                results.append(result)
+    return results
+
+def benchmark_load(app, endpoints: Sequence[str], payloads: List[bytes], concurrency_levels: Sequence[int],
+                   requests: int, warmup: int = 5, confidence: float = 0.5) -> list:
+    """
+    Uygulamayı süreç içinde (ASGI, ağ olmadan) farklı eşzamanlılık seviyelerinde yükler
+
+    Tüm seviyeler aynı event loop'ta çalışır; mikro-batch toplayıcısı ve çıkarım
+    havuzu seviyeler arasında yeniden kullanılır.
+    """
+    return asyncio.run(_run_load(app, endpoints, payloads, concurrency_levels, requests, warmup, confidence))
@@ -0,0 +1,59 @@
+import time
+from typing import List
+import numpy as np
+
+from app.schemas.plaka import PlakaResponse
+from app.services.inference_backends import InferenceBackend
+from app.services.plaka_service import PlakaService
+from app.utils.image_utils import encode_image
+from benchmarks.stats import summarize
+
+STAGES = ("decode", "inference", "postprocess", "annotate", "encode", "total")
+
+def benchmark_stages(backend: InferenceBackend, payloads: List[bytes], runs: int,
+                     confidence: float = 0.5, image_format: str = "jpeg") -> dict:
+    """
+    Tek bir isteğin aşamalarını HTTP katmanı olmadan ayrı ayrı ölçer
+
+    Aşamalar /plaka/detect-image ile aynı sırayla çalışır: imdecode, model tahmini,
+    eşik + yanıt serileştirme, kutuların çizimi ve çıktı görüntüsünün kodlanması.
+    """
+    import cv2
+
+    timings = {stage: [] for stage in STAGES}
+    for run in range(runs):
+        contents = payloads[run % len(payloads)]
+
+        started_at = time.perf_counter()
+        image = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
+        decoded_at = time.perf_counter()
+
+        boxes = backend.predict([image])[0]
+        predicted_at = time.perf_counter()
+
+        boxes = PlakaService.filter_boxes(boxes, confidence)
+        detections = PlakaService.boxes_to_detections(boxes)
+        PlakaResponse(
+            detections=detections,
+            total_detections=len(detections),
+            message=f"{len(detections)} adet plaka tespit edildi"
+        ).model_dump_json()
+        processed_at = time.perf_counter()
+
+        marked_image = PlakaService.render_detections(image, boxes)
+        annotated_at = time.perf_counter()
+
+        encode_image(marked_image, image_format)
+        encoded_at = time.perf_counter()
+
+        for stage, begin, end in (
+            ("decode", started_at, decoded_at),
+            ("inference", decoded_at, predicted_at),
+            ("postprocess", predicted_at, processed_at),
+            ("annotate", processed_at, annotated_at),
+            ("encode", annotated_at, encoded_at),
+            ("total", started_at, encoded_at),
+        ):
+            timings[stage].append((end - begin) * 1000.0)
+
+    return {stage: summarize(values) for stage, values in timings.items()}
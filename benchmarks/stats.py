@@ -0,0 +1,89 @@
+import os
+import platform
+import subprocess
+import time
+from typing import Dict, Sequence
+import numpy as np
+
+def summarize(latencies_ms: Sequence[float]) -> Dict[str, float]:
+    """Gecikme listesinden p50/p95/p99, ortalama ve en büyük değeri hesaplar"""
+    if len(latencies_ms) == 0:
+        return {"count": 0}
+    values = np.asarray(latencies_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": int(values.size),
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+def environment() -> dict:
+    """Sonuçların hangi commit ve ortamda üretildiğini kaydeder"""
+    import cv2
+    from app.core.config import settings
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": _git("rev-parse", "--short", "HEAD") or None,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {
+            "INFERENCE_WORKERS": settings.INFERENCE_WORKERS,
+            "INFERENCE_QUEUE_SIZE": settings.INFERENCE_QUEUE_SIZE,
+            "BATCHING_ENABLED": settings.BATCHING_ENABLED,
+            "BATCH_MAX_SIZE": settings.BATCH_MAX_SIZE,
+            "BATCH_MAX_WAIT_MS": settings.BATCH_MAX_WAIT_MS,
+        },
+    }
+
+def compare(baseline: dict, candidate: dict) -> list:
+    """
+    İki sonuç dosyasındaki aşama, yük ve arka uç ölçümlerini karşılaştırır
+
+    Returns:
+        list: Her ölçüm için (ad, metrik, eski, yeni, yüzde değişim) satırları
+    """
+    rows = []
+
+    def add(name, metric, old, new):
+        if old is None or new is None:
+            return
+        change = (new - old) / old * 100.0 if old else 0.0
+        rows.append((name, metric, old, new, round(change, 1)))
+
+    for stage, old in baseline.get("stages", {}).items():
+        new = candidate.get("stages", {}).get(stage)
+        if new:
+            for metric in ("p50_ms", "p95_ms", "p99_ms"):
+                add(f"stage:{stage}", metric, old.get(metric), new.get(metric))
+
+    new_levels = {(level["endpoint"], level["concurrency"]): level for level in candidate.get("load", [])}
+    for old in baseline.get("load", []):
+        new = new_levels.get((old["endpoint"], old["concurrency"]))
+        if new:
+            name = f"load:{old['endpoint']}@{old['concurrency']}"
+            for metric in ("p50_ms", "p95_ms", "p99_ms"):
+                add(name, metric, old["latency"].get(metric), new["latency"].get(metric))
+            add(name, "requests_per_second", old.get("requests_per_second"), new.get("requests_per_second"))
+
+    new_backends = {result["backend"]: result for result in candidate.get("backends", []) if "latency" in result}
+    for old in baseline.get("backends", []):
+        new = new_backends.get(old["backend"])
+        if new and "latency" in old:
+            name = f"backend:{old['backend']}"
+            for metric in ("p50_ms", "p95_ms", "p99_ms"):
+                add(name, metric, old["latency"].get(metric), new["latency"].get(metric))
+            add(name, "images_per_second", old.get("images_per_second"), new.get("images_per_second"))
+    return rows
@@ -0,0 +1,82 @@
+import time
+from typing import List, Tuple
+import cv2
+import numpy as np
+
+from app.services.inference_backends import InferenceBackend
+
+def make_plate_image(rng: np.random.Generator, width: int = 1280, height: int = 720,
+                     plates: int = 2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Koyu gürültülü arka plan üzerine beyaz plaka dikdörtgenleri çizilmiş görüntü üretir
+
+    Returns:
+        Tuple: (BGR görüntü, (N, 4) boyutlu gerçek kutular)
+    """
+    image = rng.integers(0, 140, (height, width, 3), dtype=np.uint8)
+    boxes = []
+    for _ in range(plates):
+        plate_w = int(rng.integers(width // 10, width // 5))
+        plate_h = max(plate_w // 4, 12)
+        x1 = int(rng.integers(0, width - plate_w))
+        y1 = int(rng.integers(0, height - plate_h))
+        cv2.rectangle(image, (x1, y1), (x1 + plate_w, y1 + plate_h), (255, 255, 255), -1)
+        text = f"{rng.integers(1, 82):02d} ABC {rng.integers(10, 9999)}"
+        cv2.putText(image, text, (x1 + plate_w // 20, y1 + int(plate_h * 0.75)),
+                    cv2.FONT_HERSHEY_SIMPLEX, plate_h / 45.0, (20, 20, 20), max(plate_h // 15, 1))
+        boxes.append([x1, y1, x1 + plate_w, y1 + plate_h])
+    return image, np.array(boxes, dtype=np.float32).reshape(-1, 4)
+
+def make_dataset(count: int, width: int = 1280, height: int = 720, seed: int = 0,
+                 quality: int = 90) -> List[bytes]:
+    """Tekrarlanabilir (aynı seed -> aynı baytlar) JPEG görüntü listesi üretir"""
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for _ in range(count):
+        image, _ = make_plate_image(rng, width, height, plates=int(rng.integers(1, 4)))
+        success, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not success:
+            raise RuntimeError("Sentetik görüntü kodlanamadı")
+        payloads.append(buffer.tobytes())
+    return payloads
+
+class StandInBackend(InferenceBackend):
+    """
+    GPU ve model dosyası gerektirmeyen küçük yer tutucu model
+
+    Görüntüyü MODEL_IMGSZ boyutuna küçültüp parlak dikdörtgenleri kontur analizi
+    ile bulur; sentetik görüntülerdeki plakaları tespit eder. `compute_ms` ile
+    gerçek bir modelin hesaplama süresi (GIL bırakılarak) taklit edilebilir.
+    """
+
+    name = "stand-in"
+
+    def __init__(self, imgsz: int = 640, compute_ms: float = 0.0):
+        super().__init__("stand-in")
+        self.imgsz = imgsz
+        self.compute_ms = compute_ms
+
+    def predict(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        results = [self._detect(image) for image in images]
+        if self.compute_ms > 0:
+            time.sleep(self.compute_ms / 1000.0)
+        return results
+
+    def _detect(self, image: np.ndarray) -> np.ndarray:
+        height, width = image.shape[:2]
+        scale = self.imgsz / max(height, width)
+        small = cv2.resize(image, (max(int(width * scale), 1), max(int(height * scale), 1)),
+                           interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        _, mask = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        boxes = []
+        for contour in contours:
+            x, y, box_w, box_h = cv2.boundingRect(contour)
+            if box_w < 8 or box_h < 3 or not 1.5 <= box_w / box_h <= 10:
+                continue
+            fill = cv2.contourArea(contour) / float(box_w * box_h)
+            boxes.append([x / scale, y / scale, (x + box_w) / scale, (y + box_h) / scale,
+                          min(0.5 + 0.5 * fill, 0.99)])
+        return np.array(boxes, dtype=np.float32).reshape(-1, 5)
@@ -1,14 +1,20 @@
+import asyncio
 from app.database.database import engine
 from app.models.user import User
+from app.models.detection import Detection
+from app.models.job import Job
 from app.database.database import Base
 
-def create_tables():
+async def create_tables():
     """Veritabanı tablolarını oluştur"""
     try:
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
         print("✅ Veritabanı tabloları başarıyla oluşturuldu!")
     except Exception as e:
         print(f"❌ Tablolar oluşturulurken hata oluştu: {e}")
+    finally:
+        await engine.dispose()
 
 if __name__ == "__main__":
-    create_tables()
+    asyncio.run(create_tables())
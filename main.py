@@ -1,14 +1,41 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import auth_router, users_router, plaka_router
+from app.api import auth_router, users_router, plaka_router, health_router, detections_router, jobs_router, metrics_router, models_router
+from app.api.plaka import plaka_service, inference_executor, detection_writer
+from app.api.jobs import job_queue
 from app.utils.file_utils import cleanup_temp_files
+from app.utils.tracing import MetricsMiddleware
+from app.utils.upload_utils import BodySizeLimitMiddleware
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Model yükleme ve temizlik işlerini arka planda başlatır, istekler hemen karşılanır"""
+    loop = asyncio.get_running_loop()
+    # Eski sürümlerin bıraktığı geçici dosyaları temizle
+    loop.run_in_executor(None, cleanup_temp_files)
+    # Model yüklenirken /auth ve /users istekleri karşılanmaya devam eder
+    loop.run_in_executor(None, plaka_service.load)
+    # Tespit geçmişi arka planda toplu olarak yazılır
+    await detection_writer.start()
+    # Yeniden başlatmada yarım kalan işler kuyruğa geri alınır
+    await job_queue.start()
+    # Boştaki modellerin çıkarılması ve (açıksa) model dosyası değişince yeniden yükleme
+    maintenance_task = loop.create_task(plaka_service.run_maintenance())
+    yield
+    maintenance_task.cancel()
+    await job_queue.stop()
+    await detection_writer.stop()
+    inference_executor.shutdown(wait=False)
 
 # FastAPI uygulaması oluştur
 app = FastAPI(
     title="GYK Backend API", 
     description="JWT Auth ile CRUD API ve Plaka Tespiti", 
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware ekle
@@ -20,10 +47,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Büyük gövdeler akış sırasında sayılır ve sınır aşıldığında 413 ile kesilir
+app.add_middleware(BodySizeLimitMiddleware)
+
+# İstek süresi, durum kodu ve eşzamanlı istek metrikleri (/metrics)
+app.add_middleware(MetricsMiddleware)
+
 # Router'ları ekle
 app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(plaka_router)
+app.include_router(health_router)
+app.include_router(detections_router)
+app.include_router(jobs_router)
+app.include_router(metrics_router)
+app.include_router(models_router)
 
 # Ana endpoint
 @app.get("/")
@@ -40,9 +78,13 @@ async def protected_route():
         "note": "Bu endpoint artık /users/me endpoint'i ile değiştirildi"
     }
 
-# Uygulama başlatıldığında geçici dosyaları temizle
-cleanup_temp_files()
-
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    from app.core.config import settings
+    
+    if settings.SERVER_WORKERS > 1:
+        # Model bir kez yüklenir, işçiler ağırlıkları copy-on-write olarak paylaşır
+        from app.services.worker_supervisor import WorkerSupervisor
+        WorkerSupervisor(app, settings.SERVER_WORKERS).run(settings.SERVER_HOST, settings.SERVER_PORT)
+    else:
+        import uvicorn
+        uvicorn.run(app, host=settings.SERVER_HOST, port=settings.SERVER_PORT)
\ No newline at end of file